@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+动作二进制格式 - 类型/按钮编码与定长记录布局
+独立播放进程（struct）与录制分析（numpy）共用，本模块不依赖 numpy
+"""
+
+import struct
+
+
+# 每个动作一条定长记录（小端、无填充）：(字段名, struct 类型码)
+FIELDS = (
+    ('time', 'd'),
+    ('type', 'B'),
+    ('button', 'B'),
+    ('pressed', 'B'),
+    ('x', 'i'),
+    ('y', 'i'),
+    ('dx', 'i'),
+    ('dy', 'i'),
+)
+
+ACTION_FORMAT = struct.Struct('<' + ''.join(code for _, code in FIELDS))
+
+# 动作类型编码
+TYPE_MOVE = 0
+TYPE_CLICK = 1
+TYPE_SCROLL = 2
+TYPE_CODES = {'move': TYPE_MOVE, 'click': TYPE_CLICK, 'scroll': TYPE_SCROLL}
+TYPE_NAMES = {code: name for name, code in TYPE_CODES.items()}
+
+# 按钮编码（0 表示没有按钮或无法识别）
+BUTTON_NONE = 0
+BUTTON_CODES = {'left': 1, 'right': 2, 'middle': 3}
+BUTTON_NAMES = {code: name for name, code in BUTTON_CODES.items()}
+
+
+def button_code(button_str):
+    """解析按钮字符串（如 'Button.left'），无法识别时返回 BUTTON_NONE"""
+    button_str = button_str.lower()
+    for name, code in BUTTON_CODES.items():
+        if name in button_str:
+            return code
+    return BUTTON_NONE
+
+
+def encode_action(action):
+    """将动作字典编码为按 FIELDS 顺序排列的元组"""
+    return (
+        action['time'],
+        TYPE_CODES.get(action['type'], TYPE_MOVE),
+        button_code(action['button']) if 'button' in action else BUTTON_NONE,
+        bool(action.get('pressed', False)),
+        int(action.get('x', 0)),
+        int(action.get('y', 0)),
+        int(action.get('dx', 0)),
+        int(action.get('dy', 0)),
+    )
+
+
+def decode_action(record):
+    """将按 FIELDS 顺序排列的元组还原为动作字典（与录制器保存的格式一致）"""
+    t, type_code, button, pressed, x, y, dx, dy = record
+    if type_code == TYPE_CLICK:
+        return {'type': 'click', 'x': x, 'y': y,
+                'button': f"Button.{BUTTON_NAMES.get(button, 'unknown')}",
+                'pressed': bool(pressed), 'time': t}
+    if type_code == TYPE_SCROLL:
+        return {'type': 'scroll', 'x': x, 'y': y, 'dx': dx, 'dy': dy, 'time': t}
+    return {'type': 'move', 'x': x, 'y': y, 'time': t}
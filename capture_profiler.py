@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+采集性能监控 - 统计输入钩子回调的耗时、事件采样率和回调队列深度
+钩子线程中只做 O(1) 的计数与环形缓冲写入，分位数等统计在 GUI 线程中计算
+"""
+
+import json
+import time
+from datetime import datetime
+
+
+class CallbackStats:
+    """单个回调的耗时统计（最近 window 次耗时保存在环形缓冲中）"""
+
+    def __init__(self, window=1024):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        """清空统计"""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._samples = [0.0] * self.window
+        self._index = 0
+
+    def record(self, elapsed):
+        """记录一次耗时（秒），在钩子线程中调用"""
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self._samples[self._index] = elapsed
+        self._index = (self._index + 1) % self.window
+
+    def recent(self):
+        """最近的耗时样本（秒）"""
+        if self.count < self.window:
+            return self._samples[:self.count]
+        return list(self._samples)
+
+    def percentile(self, p):
+        """最近样本的 p 分位数（秒），没有样本时返回 0"""
+        samples = sorted(self.recent())
+        if not samples:
+            return 0.0
+        index = min(len(samples) - 1, int(len(samples) * p / 100))
+        return samples[index]
+
+
+class CaptureProfiler:
+    """采集路径监控
+
+    - wrap(): 包装 pynput 回调，记录每次执行耗时
+    - count_kept(): 记录一个被保留的移动样本，用于计算采样保留率
+    - enqueued()/dequeued(): 钩子线程投递到 GUI 线程的待处理回调数
+    - tick(): 定期生成快照（在 GUI 线程中调用），用于实时显示和导出
+    """
+
+    def __init__(self, window=1024, budget_ms=1.0, min_samples=100):
+        """
+        Args:
+            window: 计算分位数使用的最近样本数
+            budget_ms: 回调 p99 耗时预算（毫秒）
+            min_samples: 判断是否超出预算所需的最少样本数（样本太少时 p99 就是最大值）
+        """
+        self.window = window
+        self.budget_ms = budget_ms
+        self.min_samples = min(min_samples, window)
+        self.callbacks = {}
+        self.reset()
+
+    def reset(self):
+        """开始新的采集会话"""
+        for stats in self.callbacks.values():
+            stats.reset()
+        self.kept_moves = 0
+        self.queued = 0
+        self.processed = 0
+        self.max_queue_depth = 0
+        self.started_at = time.perf_counter()
+        self.history = []
+        self._last_tick = (self.started_at, 0, 0)
+
+    def wrap(self, name, callback):
+        """包装回调，记录执行耗时（保留原返回值，pynput 以 False 表示停止监听）"""
+        stats = self.callbacks.get(name)
+        if stats is None:
+            stats = self.callbacks[name] = CallbackStats(self.window)
+        perf_counter = time.perf_counter
+
+        def wrapper(*args):
+            start = perf_counter()
+            try:
+                return callback(*args)
+            finally:
+                stats.record(perf_counter() - start)
+
+        return wrapper
+
+    def count_kept(self):
+        """记录一个被保留的移动样本"""
+        self.kept_moves += 1
+
+    def enqueued(self):
+        """钩子线程投递了一个 GUI 回调"""
+        self.queued += 1
+        depth = self.queued - self.processed
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    def dequeued(self):
+        """GUI 线程执行了一个投递的回调"""
+        self.processed += 1
+
+    @property
+    def queue_depth(self):
+        """当前待处理的 GUI 回调数"""
+        return self.queued - self.processed
+
+    @property
+    def move_events(self):
+        """收到的原始移动事件数"""
+        stats = self.callbacks.get('move')
+        return stats.count if stats else 0
+
+    def over_budget(self):
+        """p99 耗时超出预算的回调名称列表（样本数不足 min_samples 的回调不参与判断）"""
+        budget = self.budget_ms / 1000
+        return [name for name, stats in self.callbacks.items()
+                if stats.count >= self.min_samples and stats.percentile(99) > budget]
+
+    def tick(self):
+        """生成一次快照并加入历史记录
+
+        Returns:
+            快照字典（耗时单位为毫秒）
+        """
+        now = time.perf_counter()
+        last_time, last_moves, last_kept = self._last_tick
+        interval = now - last_time
+        moves = self.move_events
+        kept = self.kept_moves
+        self._last_tick = (now, moves, kept)
+
+        snapshot = {
+            'elapsed': now - self.started_at,
+            'move_events': moves,
+            'kept_moves': kept,
+            'keep_ratio': kept / moves if moves else 0.0,
+            'event_rate': (moves - last_moves) / interval if interval > 0 else 0.0,
+            'kept_rate': (kept - last_kept) / interval if interval > 0 else 0.0,
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'callbacks': {
+                name: {
+                    'count': stats.count,
+                    'mean_ms': stats.total / stats.count * 1000 if stats.count else 0.0,
+                    'p50_ms': stats.percentile(50) * 1000,
+                    'p99_ms': stats.percentile(99) * 1000,
+                    'max_ms': stats.max * 1000,
+                }
+                for name, stats in self.callbacks.items()
+            },
+        }
+        self.history.append(snapshot)
+        return snapshot
+
+    def format_snapshot(self, snapshot):
+        """将快照格式化为多行文本"""
+        lines = [
+            f"采集时长: {snapshot['elapsed']:.1f} 秒",
+            f"移动事件: {snapshot['move_events']} 个 ({snapshot['event_rate']:.0f}/秒)",
+            f"保留样本: {snapshot['kept_moves']} 个 ({snapshot['kept_rate']:.0f}/秒), "
+            f"保留率 {snapshot['keep_ratio']:.1%}",
+            f"回调队列: 当前 {snapshot['queue_depth']}, 最大 {snapshot['max_queue_depth']}",
+            f"回调耗时（预算 p99 < {self.budget_ms} ms）:",
+        ]
+        for name, stats in snapshot['callbacks'].items():
+            lines.append(
+                f"  {name:<6} {stats['count']:>8} 次  平均 {stats['mean_ms']:.3f} ms  "
+                f"p50 {stats['p50_ms']:.3f} ms  p99 {stats['p99_ms']:.3f} ms  "
+                f"最大 {stats['max_ms']:.3f} ms"
+            )
+        return "\n".join(lines)
+
+    def export(self, filepath):
+        """导出本次会话的统计（最近一次快照 + 历史快照）为 JSON"""
+        data = {
+            'exported_at': datetime.now().isoformat(),
+            'budget_ms': self.budget_ms,
+            'window': self.window,
+            'summary': self.history[-1] if self.history else self.tick(),
+            'history': self.history,
+        }
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
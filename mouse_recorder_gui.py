@@ -6,45 +6,170 @@
 """
 
 import json
+import math
+import queue
 import time
 import threading
-import ctypes
-from ctypes import wintypes
 import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
 from pathlib import Path
 from datetime import datetime
-from pynput import mouse, keyboard
-from pynput.mouse import Button, Controller as MouseController
-from pynput.keyboard import Key, Listener as KeyboardListener
+from recording_editor import EditableRecording
+from capture_profiler import CaptureProfiler
 
 
-# ============ Windows API 定义 ============
+# 首帧绘制后延迟多久启动全局热键监听（毫秒）
+HOTKEY_START_DELAY_MS = 50
 
-class MOUSEINPUT(ctypes.Structure):
-    """Windows MOUSEINPUT 结构体"""
-    _fields_ = [
-        ('dx', wintypes.LONG),
-        ('dy', wintypes.LONG),
-        ('mouseData', wintypes.DWORD),
-        ('dwFlags', wintypes.DWORD),
-        ('time', wintypes.DWORD),
-        ('dwExtraInfo', ctypes.POINTER(ctypes.c_ulong))
-    ]
+# 录制文件类型；.npy 以 mmap 方式加载，轨迹分析无需逐条转换（需要 numpy）
+RECORDING_FILETYPES = [("JSON 文件", "*.json"), ("NumPy 录制", "*.npy"), ("所有文件", "*.*")]
 
+# 超过此动作数且不是 .npy 录制时，提示保存为 .npy 以加快分析
+LARGE_RECORDING = 1_000_000
 
-class INPUT(ctypes.Structure):
-    """Windows INPUT 结构体（联合体简化版）"""
-    _fields_ = [
-        ('type', wintypes.DWORD),
-        ('mi', MOUSEINPUT)
-    ]
 
+# ============ 自适应采样 ============
 
-# Windows API 常量
-INPUT_MOUSE = 0
-MOUSEEVENTF_MOVE = 0x0001
-MOUSEEVENTF_ABSOLUTE = 0x8000
+class AdaptiveMoveFilter:
+    """自适应移动采样过滤器
+
+    以最后保留的点为锚点，把锚点到最新位置看作一段按时间的线性插值
+    （回放时 _interpolate_move 即按此移动）。
+    每来一个事件，检查上一个待定点和锚点以来 1/4、1/2、3/4 时刻的点
+    与该插值的时间同步距离；超出误差容限、方向或速度相对锚点处明显变化、
+    或距上一个保留点过久时，保留上一个待定点作为新锚点。
+    误差容限只在这几个检查点上检验，不是严格上界，曲线运动时
+    其他点的误差可能略微超出；检查点的下标只会单调前移，每个事件均摊 O(1)。
+    静止或匀速直线运动时几乎不产生样本。
+    """
+
+    CHECKPOINTS = (0.25, 0.5, 0.75)
+
+    def __init__(self, tolerance=3.0, angle_threshold=20.0, speed_ratio=0.5,
+                 max_interval=0.5, min_speed=50.0):
+        """
+        Args:
+            tolerance: 空间误差容限（像素，在检查点上检验）
+            angle_threshold: 方向变化阈值（度）
+            speed_ratio: 速度相对变化阈值
+            max_interval: 两个保留点之间的最长时间（秒）
+            min_speed: 低于该速度（像素/秒）时不判断方向和速度变化
+        """
+        self.tolerance = tolerance
+        self.cos_threshold = math.cos(math.radians(angle_threshold))
+        self.speed_ratio = speed_ratio
+        self.max_interval = max_interval
+        self.min_speed = min_speed
+        self.reset()
+
+    def reset(self):
+        """清空状态，开始新的录制"""
+        self._anchor = None        # 最后保留的点 (x, y, t)
+        self._segment = []         # 锚点之后、尚未保留的点
+        self._cursors = [0] * len(self.CHECKPOINTS)
+        self._ref_velocity = None  # 锚点处的速度，用于判断方向和速度变化
+
+    def feed(self, x, y, t):
+        """输入一个移动事件
+
+        Returns:
+            需要保留的点 (x, y, t)，没有则返回 None
+        """
+        point = (x, y, t)
+
+        if self._anchor is None:
+            self._anchor = point
+            return point
+
+        if self._segment and self._should_keep(x, y, t):
+            kept = self._segment[-1]
+            self._start_segment(kept)
+        else:
+            kept = None
+
+        self._segment.append(point)
+        if self._ref_velocity is None:
+            self._estimate_velocity(x, y, t)
+        return kept
+
+    def flush(self):
+        """取出尚未保留的最后位置（点击、滚轮或停止录制前调用）
+
+        Returns:
+            需要保留的点 (x, y, t)，没有则返回 None
+        """
+        if not self._segment:
+            return None
+
+        kept = self._segment[-1]
+        self._start_segment(kept)
+        return kept
+
+    def _start_segment(self, anchor):
+        """以 anchor 为新锚点开始一段"""
+        self._anchor = anchor
+        self._segment = []
+        self._cursors = [0] * len(self.CHECKPOINTS)
+        self._ref_velocity = None
+
+    def _estimate_velocity(self, x, y, t):
+        """位移超过误差容限后，用锚点到当前点的平均速度作为锚点处速度"""
+        ax, ay, at = self._anchor
+        dx = x - ax
+        dy = y - ay
+        dt = t - at
+        if dt > 0 and dx * dx + dy * dy >= self.tolerance * self.tolerance:
+            self._ref_velocity = (dx / dt, dy / dt)
+
+    def _should_keep(self, x, y, t):
+        """判断加入 (x, y, t) 后，上一个待定点是否需要保留"""
+        ax, ay, at = self._anchor
+        dt = t - at
+        if dt >= self.max_interval:
+            return True
+        if dt <= 0:
+            return False
+
+        dx = x - ax
+        dy = y - ay
+        tolerance_sq = self.tolerance * self.tolerance
+
+        # 检查点到插值的时间同步距离
+        segment = self._segment
+        last = len(segment) - 1
+        for i, fraction in enumerate(self.CHECKPOINTS):
+            cursor = self._cursors[i]
+            target = at + dt * fraction
+            while cursor < last and segment[cursor + 1][2] <= target:
+                cursor += 1
+            self._cursors[i] = cursor
+            if self._deviation_sq(segment[cursor], ax, ay, at, dx, dy, dt) > tolerance_sq:
+                return True
+        if self._deviation_sq(segment[last], ax, ay, at, dx, dy, dt) > tolerance_sq:
+            return True
+
+        # 方向与速度变化（锚点处速度 vs 锚点以来的平均速度）
+        if self._ref_velocity is not None and dx * dx + dy * dy >= tolerance_sq:
+            rx, ry = self._ref_velocity
+            sx = dx / dt
+            sy = dy / dt
+            ref_speed = math.hypot(rx, ry)
+            avg_speed = math.hypot(sx, sy)
+            if ref_speed >= self.min_speed and avg_speed >= self.min_speed:
+                cos_angle = (rx * sx + ry * sy) / (ref_speed * avg_speed)
+                return (cos_angle < self.cos_threshold or
+                        abs(avg_speed - ref_speed) > self.speed_ratio * ref_speed)
+
+        return False
+
+    @staticmethod
+    def _deviation_sq(point, ax, ay, at, dx, dy, dt):
+        """point 与锚点出发的线性插值在同一时刻的距离平方"""
+        px, py, pt = point
+        progress = (pt - at) / dt
+        ex = ax + dx * progress - px
+        ey = ay + dy * progress - py
+        return ex * ex + ey * ey
 
 
 class MouseRecorderGUI:
@@ -62,16 +187,35 @@ class MouseRecorderGUI:
         self.is_playing = False
         self.is_paused = False
         self.start_time = None
-        self.mouse_controller = MouseController()
+        self._mouse_controller = None  # 首次使用时创建（延迟导入 pynput）
+        self._mouse_input = None  # 首次使用时绑定 SendInput
         self.mouse_listener = None
         self.last_move_time = 0
         self.move_threshold = 0.05
+        self.adaptive_sampling = True  # 自适应采样开关
+        self.move_filter = AdaptiveMoveFilter()
+        # 采样过滤器和录制中的动作列表由钩子线程与 GUI 线程共用，修改时需持有此锁
+        # 钩子线程持锁期间不调用 tkinter，GUI 线程可以放心等待
+        self._capture_lock = threading.Lock()
+        self._capture_queue = queue.SimpleQueue()  # 钩子线程 → GUI 线程的回调
+        self._drain_job = None
+        self.profiler = CaptureProfiler(budget_ms=1.0)  # 钩子回调 p99 预算 1 毫秒
+        self.capture_degraded = False  # 回调超出预算后降级为低开销采集
+        self.capture_snapshot = None  # 最近一次采集统计快照
+        self.capture_stats_text = None  # 采集监控窗口中的文本
+        self._watchdog_job = None
+        self._adaptive_before_degrade = True
         self.playback_speed = 1.0
         self.loop_mode = False
         self.current_file = None
         self.smooth_move = True  # 平滑移动开关
         self.move_steps = 20  # 平滑移动的步数（增加到220步，更流畅）
+        self.move_interval = 0.01  # 回放移动轨迹时的插值间隔（秒）
         self.keyboard_listener = None  # 键盘监听器
+        self.process_playback = False  # 独立进程播放开关
+        self.playback_worker = None  # 独立播放进程
+        self.is_analyzing = False  # 轨迹分析是否在后台线程中进行
+        self.hotkeys = {}  # 热键 → 处理函数
 
         # 设置样式
         self.setup_styles()
@@ -82,8 +226,10 @@ class MouseRecorderGUI:
         # 绑定关闭事件
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
-        # 启动全局热键监听
-        self.start_hotkey_listener()
+        # 首帧绘制后再启动全局热键监听（导入 pynput 较慢）
+        # after_idle 会与首帧的布局、映射在同一轮空闲处理中执行，因此等待首个 <Expose>
+        self._first_exposed = False
+        self.root.bind('<Expose>', self._on_first_expose, add='+')
 
     def setup_styles(self):
         """设置界面样式"""
@@ -169,6 +315,30 @@ class MouseRecorderGUI:
             width=12
         ).pack(side=tk.LEFT, padx=5)
 
+        ttk.Button(
+            file_frame,
+            text="✂️ 编辑录制",
+            command=self.open_editor,
+            style='Action.TButton',
+            width=12
+        ).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(
+            file_frame,
+            text="📈 采集监控",
+            command=self.show_capture_stats,
+            style='Action.TButton',
+            width=12
+        ).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(
+            file_frame,
+            text="🔥 轨迹分析",
+            command=self.show_analytics,
+            style='Action.TButton',
+            width=12
+        ).pack(side=tk.LEFT, padx=5)
+
         # === 设置区域 ===
         settings_frame = ttk.LabelFrame(main_frame, text="播放设置", padding="10")
         settings_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
@@ -193,6 +363,16 @@ class MouseRecorderGUI:
         )
         smooth_check.pack(side=tk.LEFT, padx=10)
 
+        # 独立进程播放
+        self.process_var = tk.BooleanVar(value=False)
+        process_check = ttk.Checkbutton(
+            settings_frame,
+            text="🧵 独立进程播放",
+            variable=self.process_var,
+            command=self.toggle_process_playback
+        )
+        process_check.pack(side=tk.LEFT, padx=10)
+
         # 速度调节
         ttk.Label(settings_frame, text="⚡ 播放速度:").pack(side=tk.LEFT, padx=(20, 5))
 
@@ -224,6 +404,16 @@ class MouseRecorderGUI:
 
         ttk.Label(settings_frame, text="秒").pack(side=tk.LEFT)
 
+        # 自适应采样
+        self.adaptive_var = tk.BooleanVar(value=True)
+        adaptive_check = ttk.Checkbutton(
+            settings_frame,
+            text="📐 自适应采样",
+            variable=self.adaptive_var,
+            command=self.toggle_adaptive
+        )
+        adaptive_check.pack(side=tk.LEFT, padx=10)
+
         # === 状态栏 ===
         status_frame = ttk.Frame(main_frame)
         status_frame.grid(row=3, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
@@ -289,6 +479,14 @@ class MouseRecorderGUI:
         """更新状态栏"""
         self.status_label.config(text=message, foreground=color)
 
+    @property
+    def mouse_controller(self):
+        """pynput 鼠标控制器"""
+        if self._mouse_controller is None:
+            from pynput.mouse import Controller
+            self._mouse_controller = Controller()
+        return self._mouse_controller
+
     def update_action_count(self):
         """更新动作计数"""
         self.action_count_label.config(text=f"动作数: {len(self.actions)}")
@@ -311,6 +509,9 @@ class MouseRecorderGUI:
         self.is_recording = True
         self.start_time = time.time()
         self.last_move_time = 0
+        self.move_filter.reset()
+        self.profiler.reset()
+        self.capture_degraded = False
 
         self.record_btn.config(text="⏹️ 停止录制")
         self.play_btn.config(state='disabled')
@@ -318,49 +519,121 @@ class MouseRecorderGUI:
         self.log("🔴 开始录制鼠标动作...")
 
         # 启动鼠标监听器
+        from pynput import mouse
         self.mouse_listener = mouse.Listener(
-            on_move=self._on_move,
-            on_click=self._on_click,
-            on_scroll=self._on_scroll
+            on_move=self.profiler.wrap('move', self._on_move),
+            on_click=self.profiler.wrap('click', self._on_click),
+            on_scroll=self.profiler.wrap('scroll', self._on_scroll)
         )
         self.mouse_listener.start()
 
+        # 启动钩子耗时监控和回调队列处理
+        self._watchdog_job = self.root.after(1000, self._capture_watchdog)
+        self._drain_job = self.root.after(50, self._drain_capture_queue)
+
     def stop_recording(self):
         """停止录制"""
         if not self.is_recording:
             return
 
-        self.is_recording = False
+        with self._capture_lock:
+            self.is_recording = False
+        for job in (self._watchdog_job, self._drain_job):
+            if job:
+                self.root.after_cancel(job)
+        self._watchdog_job = self._drain_job = None
         if self.mouse_listener:
+            # 等待正在执行的回调结束（回调不调用 tkinter，不会与此处互相等待）
             self.mouse_listener.stop()
+            self.mouse_listener.join(1.0)
             self.mouse_listener = None
 
+        # 补上最后的位置
+        with self._capture_lock:
+            self._flush_move()
+        self._drain_capture_queue()
+
+        # 恢复降级前的采样设置
+        if self.capture_degraded:
+            self._set_adaptive_sampling(self._adaptive_before_degrade)
+            self.adaptive_var.set(self.adaptive_sampling)
+
         self.record_btn.config(text="🔴 开始录制")
         self.play_btn.config(state='normal')
         self.update_status("就绪", 'green')
         self.update_action_count()
         self.log(f"⏹️  录制停止，共录制 {len(self.actions)} 个动作")
 
+        snapshot = self.capture_snapshot = self.profiler.tick()
+        self._refresh_capture_stats()
+        move_stats = snapshot['callbacks'].get('move')
+        if move_stats:
+            self.log(f"📈 移动事件 {snapshot['move_events']} 个，保留 {snapshot['kept_moves']} 个 "
+                     f"({snapshot['keep_ratio']:.1%})，回调 p99 {move_stats['p99_ms']:.3f} ms")
+
     def _on_move(self, x, y):
         """鼠标移动事件"""
-        if self.is_recording:
+        with self._capture_lock:
+            if not self.is_recording:
+                return
             current_time = time.time()
             timestamp = current_time - self.start_time
 
-            if timestamp - self.last_move_time >= self.move_threshold:
-                self.actions.append({
-                    'type': 'move',
-                    'x': x,
-                    'y': y,
-                    'time': timestamp
-                })
+            if self.adaptive_sampling:
+                point = self.move_filter.feed(x, y, timestamp)
+                if point:
+                    self._append_move(*point)
+            elif timestamp - self.last_move_time >= self.move_threshold:
+                self._append_move(x, y, timestamp)
                 self.last_move_time = timestamp
-                self.root.after(0, self.update_action_count)
+
+    def _append_move(self, x, y, timestamp):
+        """记录一个移动动作"""
+        self.actions.append({
+            'type': 'move',
+            'x': x,
+            'y': y,
+            'time': timestamp
+        })
+        self.profiler.count_kept()
+
+    def _post(self, callback):
+        """从钩子线程投递回调到 GUI 线程
+
+        只放入队列，不调用 tkinter（跨线程调用 tkinter 会等待 GUI 线程处理），
+        由 _drain_capture_queue 在 GUI 线程中执行
+        """
+        self.profiler.enqueued()
+        self._capture_queue.put(callback)
+
+    def _drain_capture_queue(self):
+        """在 GUI 线程中执行钩子线程投递的回调，并刷新动作计数"""
+        while True:
+            try:
+                callback = self._capture_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.profiler.dequeued()
+            callback()
+
+        self.update_action_count()
+        if self.is_recording:
+            self._drain_job = self.root.after(50, self._drain_capture_queue)
+
+    def _flush_move(self):
+        """保留自适应采样中尚未保留的最后位置（调用方需持有 _capture_lock）"""
+        if self.adaptive_sampling:
+            point = self.move_filter.flush()
+            if point:
+                self._append_move(*point)
 
     def _on_click(self, x, y, button, pressed):
         """鼠标点击事件"""
-        if self.is_recording:
+        with self._capture_lock:
+            if not self.is_recording:
+                return
             timestamp = time.time() - self.start_time
+            self._flush_move()
             self.actions.append({
                 'type': 'click',
                 'x': x,
@@ -369,13 +642,17 @@ class MouseRecorderGUI:
                 'pressed': pressed,
                 'time': timestamp
             })
-            action_type = "按下" if pressed else "释放"
-            self.root.after(0, lambda: self.log(f"🖱️  {button.name} {action_type} at ({x}, {y})"))
+            if not self.capture_degraded:
+                action_type = "按下" if pressed else "释放"
+                self._post(lambda: self.log(f"🖱️  {button.name} {action_type} at ({x}, {y})"))
 
     def _on_scroll(self, x, y, dx, dy):
         """鼠标滚轮事件"""
-        if self.is_recording:
+        with self._capture_lock:
+            if not self.is_recording:
+                return
             timestamp = time.time() - self.start_time
+            self._flush_move()
             self.actions.append({
                 'type': 'scroll',
                 'x': x,
@@ -384,7 +661,104 @@ class MouseRecorderGUI:
                 'dy': dy,
                 'time': timestamp
             })
-            self.root.after(0, lambda: self.log(f"🎡 滚轮滚动 at ({x}, {y}), dy={dy}"))
+            if not self.capture_degraded:
+                self._post(lambda: self.log(f"🎡 滚轮滚动 at ({x}, {y}), dy={dy}"))
+
+    # ============ 采集监控 ============
+
+    def _capture_watchdog(self):
+        """定期检查钩子回调耗时，超出预算时降级为低开销采集"""
+        if not self.is_recording:
+            return
+
+        self.capture_snapshot = self.profiler.tick()
+        self.update_action_count()
+        self._refresh_capture_stats()
+
+        slow = self.profiler.over_budget()
+        if slow and not self.capture_degraded:
+            self._degrade_capture(slow)
+
+        self._watchdog_job = self.root.after(1000, self._capture_watchdog)
+
+    def _degrade_capture(self, slow):
+        """降级采集：改用固定间隔采样，不再从钩子线程刷新界面"""
+        self.capture_degraded = True
+        self._adaptive_before_degrade = self.adaptive_sampling
+        if self.adaptive_sampling:
+            # 与钩子线程互斥地保留待定点并切换，避免过滤器状态被同时修改
+            self._set_adaptive_sampling(False)
+            self.adaptive_var.set(False)
+
+        callbacks = self.capture_snapshot['callbacks']
+        details = ", ".join(f"{name} {callbacks[name]['p99_ms']:.3f} ms" for name in slow)
+        self.log(f"⚠️  钩子回调 p99 超出预算 {self.profiler.budget_ms} ms ({details})")
+        self.log("⚠️  已降级为固定间隔采样，并停止实时日志，避免系统输入卡顿")
+        self.update_status("录制中（已降级）...", 'red')
+
+    def show_capture_stats(self):
+        """显示采集监控窗口（录制时每秒刷新）"""
+        window = tk.Toplevel(self.root)
+        window.title("📈 采集监控")
+
+        self.capture_stats_text = tk.StringVar()
+        ttk.Label(
+            window,
+            textvariable=self.capture_stats_text,
+            font=('Consolas', 9),
+            justify=tk.LEFT
+        ).pack(padx=10, pady=10, anchor=tk.W)
+
+        ttk.Button(
+            window,
+            text="💾 导出统计",
+            command=self.export_capture_stats,
+            style='Action.TButton',
+            width=12
+        ).pack(pady=(0, 10))
+
+        window.protocol("WM_DELETE_WINDOW", lambda: self._close_capture_stats(window))
+        self._refresh_capture_stats()
+
+    def _close_capture_stats(self, window):
+        """关闭采集监控窗口"""
+        self.capture_stats_text = None
+        window.destroy()
+
+    def _refresh_capture_stats(self):
+        """刷新采集监控窗口"""
+        if self.capture_stats_text is None:
+            return
+        if self.capture_snapshot is None:
+            self.capture_stats_text.set("暂无采集数据，开始录制后显示")
+        else:
+            self.capture_stats_text.set(self.profiler.format_snapshot(self.capture_snapshot))
+
+    def export_capture_stats(self):
+        """导出采集统计"""
+        if self.capture_snapshot is None:
+            messagebox.showwarning("警告", "暂无采集数据！")
+            return
+
+        recordings_dir = Path("recordings")
+        recordings_dir.mkdir(exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        filepath = filedialog.asksaveasfilename(
+            initialdir=recordings_dir,
+            initialfile=f"capture_stats_{timestamp}.json",
+            defaultextension=".json",
+            filetypes=[("JSON 文件", "*.json"), ("所有文件", "*.*")]
+        )
+        if not filepath:
+            return
+
+        try:
+            self.profiler.export(filepath)
+            self.log(f"💾 采集统计已导出: {Path(filepath).name}")
+        except Exception as e:
+            self.log(f"❌ 导出失败: {e}")
+            messagebox.showerror("错误", f"导出失败:\n{e}")
 
     # ============ 播放功能 ============
 
@@ -407,6 +781,8 @@ class MouseRecorderGUI:
         if self.is_playing and self.is_paused:
             # 继续播放
             self.is_paused = False
+            if self.playback_worker:
+                self.playback_worker.resume()
             self.play_btn.config(text="⏸️ 暂停")
             self.update_status("播放中...", 'blue')
             self.log("▶️  继续播放...")
@@ -421,13 +797,75 @@ class MouseRecorderGUI:
         self.update_status("播放中...", 'blue')
         self.log(f"▶️  开始播放，共 {len(self.actions)} 个动作...")
 
+        if self.process_playback:
+            self._start_worker_playback()
+            return
+
+        if self._mouse_input is not None:
+            self._mouse_input.refresh_metrics()
+
         # 在新线程中执行
         threading.Thread(target=self._execute_actions, daemon=True).start()
 
+    def _start_worker_playback(self):
+        """在独立进程中播放"""
+        if self.playback_worker:
+            # 上一次播放停止后进程可能尚未退出
+            self.playback_worker.close()
+            self.playback_worker = None
+
+        try:
+            from playback_worker import PlaybackWorker
+            self.playback_worker = PlaybackWorker(
+                self.actions,
+                speed=self.playback_speed,
+                loop=self.loop_mode,
+                smooth=self.smooth_move,
+                move_steps=self.move_steps,
+                move_interval=self.move_interval
+            )
+            self.playback_worker.start()
+        except Exception as e:
+            self.log(f"❌ 启动播放进程失败: {e}")
+            if self.playback_worker:
+                self.playback_worker.close()
+                self.playback_worker = None
+            self._reset_playback_ui()
+            return
+
+        self.log("🧵 已在独立进程中播放")
+        self.root.after(100, self._poll_playback_worker, self.playback_worker)
+
+    def _poll_playback_worker(self, worker):
+        """读取播放进程的消息和进度"""
+        if worker is not self.playback_worker:
+            return
+
+        # 先判断存活再取消息，保证进程退出前发送的消息都能读到
+        alive = worker.is_alive()
+        for kind, message in worker.poll_events():
+            if kind == 'error':
+                self.log(f"⚠️  {message}")
+            else:
+                self.log(f"🔄 {message}")
+
+        if alive:
+            if self.is_playing and not self.is_paused:
+                _, current_time = worker.progress
+                self.update_status(f"播放中... {current_time:.1f}/{worker.duration:.1f}秒", 'blue')
+            self.root.after(100, self._poll_playback_worker, worker)
+            return
+
+        worker.close()
+        self.playback_worker = None
+        self._playback_finished()
+
     def pause_playback(self):
         """暂停播放"""
         if self.is_playing and not self.is_paused:
             self.is_paused = True
+            if self.playback_worker:
+                self.playback_worker.pause()
             self.play_btn.config(text="▶️ 继续")
             self.update_status("已暂停", 'orange')
             self.log("⏸️  播放已暂停")
@@ -436,6 +874,8 @@ class MouseRecorderGUI:
         """停止播放"""
         self.is_playing = False
         self.is_paused = False
+        if self.playback_worker:
+            self.playback_worker.stop()
         self.play_btn.config(text="▶️ 播放", state='normal')
         self.stop_btn.config(state='disabled')
         self.record_btn.config(state='normal')
@@ -447,6 +887,7 @@ class MouseRecorderGUI:
         try:
             while True:
                 prev_time = 0
+                prev_pos = None
 
                 for action in self.actions:
                     if not self.is_playing:
@@ -459,19 +900,23 @@ class MouseRecorderGUI:
                     if not self.is_playing:
                         return
 
-                    # 等待时间间隔
-                    time_diff = action['time'] - prev_time
-                    if time_diff > 0:
-                        time.sleep(time_diff / self.playback_speed)
+                    time_diff = max(action['time'] - prev_time, 0) / self.playback_speed
                     prev_time = action['time']
 
                     # 执行动作
                     try:
                         if action['type'] == 'move':
-                            # 使用平滑移动，增加移动时间让轨迹更明显
-                            move_duration = min(time_diff / self.playback_speed, 0.5)  # 最多0.5秒
-                            self._smooth_move_to(action['x'], action['y'], move_duration)
-                        elif action['type'] == 'click':
+                            # 在两个录制点之间按时间线性插值，与自适应采样的假设一致
+                            self._interpolate_move(prev_pos, action['x'], action['y'], time_diff)
+                            prev_pos = (action['x'], action['y'])
+                            continue
+
+                        # 等待时间间隔
+                        if time_diff > 0:
+                            time.sleep(time_diff)
+                        prev_pos = (action['x'], action['y'])
+
+                        if action['type'] == 'click':
                             # 先平滑移动到点击位置，移动时间更长
                             self._smooth_move_to(action['x'], action['y'], 0.15)
                             button = self._parse_button(action['button'])
@@ -497,16 +942,21 @@ class MouseRecorderGUI:
 
     def _playback_finished(self):
         """播放完成"""
+        self._reset_playback_ui()
+        self.log("✅ 播放完成")
+
+    def _reset_playback_ui(self):
+        """恢复为未播放状态"""
         self.is_playing = False
         self.is_paused = False
         self.play_btn.config(text="▶️ 播放", state='normal')
         self.stop_btn.config(state='disabled')
         self.record_btn.config(state='normal')
         self.update_status("就绪", 'green')
-        self.log("✅ 播放完成")
 
     def _parse_button(self, button_str):
         """解析按钮"""
+        from pynput.mouse import Button
         if 'left' in button_str.lower():
             return Button.left
         elif 'right' in button_str.lower():
@@ -522,33 +972,42 @@ class MouseRecorderGUI:
             x: 目标 X 坐标（屏幕绝对坐标）
             y: 目标 Y 坐标（屏幕绝对坐标）
         """
-        # 获取屏幕尺寸
-        screen_width = ctypes.windll.user32.GetSystemMetrics(0)
-        screen_height = ctypes.windll.user32.GetSystemMetrics(1)
-
-        # 转换为 Windows 归一化坐标（0-65535）
-        normalized_x = int(x * 65535 / screen_width)
-        normalized_y = int(y * 65535 / screen_height)
-
-        # 创建 MOUSEINPUT 结构
-        mi = MOUSEINPUT(
-            dx=normalized_x,
-            dy=normalized_y,
-            mouseData=0,
-            dwFlags=MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE,
-            time=0,
-            dwExtraInfo=None
-        )
+        if self._mouse_input is None:
+            from windows_input import WindowsMouseInput
+            self._mouse_input = WindowsMouseInput()
+        self._mouse_input.move(x, y)
 
-        # 创建 INPUT 结构
-        input_event = INPUT(type=INPUT_MOUSE, mi=mi)
+    def _interpolate_move(self, start, target_x, target_y, duration):
+        """在 duration 秒内从 start 匀速移动到目标位置
 
-        # 发送输入事件
-        ctypes.windll.user32.SendInput(
-            1,  # 事件数量
-            ctypes.byref(input_event),  # 事件指针
-            ctypes.sizeof(INPUT)  # 结构体大小
-        )
+        每隔 move_interval 秒按已经过的时间计算插值位置，
+        sleep 的误差不会累积，总耗时与录制的时间间隔一致。
+
+        Args:
+            start: 起点 (x, y)，None 表示等待结束后直接跳转
+            target_x: 目标 X 坐标
+            target_y: 目标 Y 坐标
+            duration: 移动持续时间（秒）
+        """
+        if start is None or start == (target_x, target_y):
+            if duration > 0:
+                time.sleep(duration)
+            self._windows_move_mouse(target_x, target_y)
+            return
+
+        start_x, start_y = start
+        distance_x = target_x - start_x
+        distance_y = target_y - start_y
+        started = time.perf_counter()
+        while True:
+            elapsed = time.perf_counter() - started
+            if elapsed >= duration or not self.is_playing:
+                break
+            progress = elapsed / duration
+            self._windows_move_mouse(int(start_x + distance_x * progress),
+                                     int(start_y + distance_y * progress))
+            time.sleep(min(self.move_interval, duration - elapsed))
+        self._windows_move_mouse(target_x, target_y)
 
     def _smooth_move_to(self, target_x, target_y, duration=0.1):
         """平滑移动鼠标到目标位置
@@ -613,27 +1072,32 @@ class MouseRecorderGUI:
             initialdir=recordings_dir,
             initialfile=default_filename,
             defaultextension=".json",
-            filetypes=[("JSON 文件", "*.json"), ("所有文件", "*.*")]
+            filetypes=RECORDING_FILETYPES
         )
 
         if not filepath:
             return
 
         try:
-            data = {
-                'version': '1.0',
-                'created_at': datetime.now().isoformat(),
-                'action_count': len(self.actions),
-                'duration': self.actions[-1]['time'] if self.actions else 0,
-                'actions': self.actions
-            }
+            duration = self._recording_duration()
+            if Path(filepath).suffix.lower() == '.npy':
+                import recording_analytics as analytics
+                analytics.save_binary(filepath, analytics.actions_to_array(self.actions))
+            else:
+                data = {
+                    'version': '1.0',
+                    'created_at': datetime.now().isoformat(),
+                    'action_count': len(self.actions),
+                    'duration': duration,
+                    'actions': list(self.actions)
+                }
 
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
 
             self.current_file = Path(filepath)
             self.log(f"💾 录制已保存: {self.current_file.name}")
-            self.log(f"   动作数: {len(self.actions)}, 时长: {data['duration']:.2f}秒")
+            self.log(f"   动作数: {len(self.actions)}, 时长: {duration:.2f}秒")
             messagebox.showinfo("成功", f"录制已保存到:\n{filepath}")
 
         except Exception as e:
@@ -649,47 +1113,254 @@ class MouseRecorderGUI:
         filepath = filedialog.askopenfilename(
             initialdir="recordings",
             title="选择录制文件",
-            filetypes=[("JSON 文件", "*.json"), ("所有文件", "*.*")]
+            filetypes=RECORDING_FILETYPES
         )
 
         if not filepath:
             return
 
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            self.actions = data.get('actions', [])
-            self.current_file = Path(filepath)
+            filepath = Path(filepath)
+            if filepath.suffix.lower() == '.npy':
+                self.actions = self._read_actions(filepath)
+                created_at = datetime.fromtimestamp(filepath.stat().st_mtime).isoformat()
+            else:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.actions = data.get('actions', [])
+                created_at = data.get('created_at', 'Unknown')
+            self.current_file = filepath
 
             self.update_action_count()
             self.log(f"📂 录制已加载: {self.current_file.name}")
-            self.log(f"   创建时间: {data.get('created_at', 'Unknown')}")
-            self.log(f"   动作数: {len(self.actions)}, 时长: {data.get('duration', 0):.2f}秒")
+            self.log(f"   创建时间: {created_at}")
+            self.log(f"   动作数: {len(self.actions)}, 时长: {self._recording_duration():.2f}秒")
             messagebox.showinfo("成功", f"录制已加载:\n{filepath}")
 
         except Exception as e:
             self.log(f"❌ 加载失败: {e}")
             messagebox.showerror("错误", f"加载失败:\n{e}")
 
+    def _read_actions(self, filepath):
+        """读取录制文件中的动作列表（.npy 以 mmap 方式打开，需要 numpy）"""
+        if Path(filepath).suffix.lower() == '.npy':
+            import recording_analytics as analytics
+            return analytics.RecordingArray(analytics.load_recording(filepath))
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get('actions', [])
+
+    # ============ 编辑功能 ============
+
+    def open_editor(self):
+        """打开录制编辑面板"""
+        if self.is_recording or self.is_playing:
+            messagebox.showwarning("警告", "请先停止录制或播放！")
+            return
+        if not self.actions:
+            messagebox.showwarning("警告", "没有可编辑的录制！")
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("✂️ 编辑录制")
+        window.resizable(False, False)
+
+        range_frame = ttk.LabelFrame(window, text="时间范围（秒）", padding="10")
+        range_frame.pack(fill=tk.X, padx=10, pady=(10, 5))
+
+        self.edit_start_var = tk.StringVar(value="0")
+        self.edit_end_var = tk.StringVar(value=f"{self._recording_duration():.2f}")
+        self.edit_factor_var = tk.StringVar(value="1.0")
+
+        for label, var in (("开始:", self.edit_start_var),
+                           ("结束:", self.edit_end_var),
+                           ("时间倍率:", self.edit_factor_var)):
+            ttk.Label(range_frame, text=label).pack(side=tk.LEFT, padx=(10, 5))
+            ttk.Entry(range_frame, textvariable=var, width=10).pack(side=tk.LEFT)
+
+        action_frame = ttk.Frame(window, padding="10")
+        action_frame.pack(fill=tk.X)
+
+        for text, command in (("✂️ 裁剪", self.edit_trim),
+                              ("🗑️ 剪切", self.edit_cut),
+                              ("⏱️ 调速", self.edit_retime),
+                              ("📥 插入录制", self.edit_insert),
+                              ("➕ 追加录制", self.edit_concatenate),
+                              ("🗜️ 压缩", self.edit_compact)):
+            ttk.Button(
+                action_frame,
+                text=text,
+                command=command,
+                style='Action.TButton',
+                width=10
+            ).pack(side=tk.LEFT, padx=3)
+
+        ttk.Label(
+            window,
+            text="裁剪: 只保留范围内动作 | 剪切: 删除范围内动作 | 调速: 范围内时间乘以倍率\n"
+                 "插入: 在开始时间处插入其他录制 | 压缩: 合并编辑结果（保存前可选）",
+            font=('Arial', 8),
+            foreground='gray'
+        ).pack(padx=10, pady=(0, 10))
+
+    def _recording_duration(self):
+        """当前录制时长"""
+        if isinstance(self.actions, EditableRecording):
+            return self.actions.duration
+        return self.actions[-1]['time'] if self.actions else 0
+
+    def _editable_actions(self):
+        """将当前动作转换为可编辑录制（不复制动作）"""
+        if not isinstance(self.actions, EditableRecording):
+            self.actions = EditableRecording.from_actions(self.actions)
+        return self.actions
+
+    def _edit_range(self):
+        """读取编辑面板中的时间范围"""
+        try:
+            return float(self.edit_start_var.get()), float(self.edit_end_var.get())
+        except ValueError:
+            messagebox.showerror("错误", "请输入有效的时间！")
+            return None
+
+    def _after_edit(self, message):
+        """编辑完成后更新界面"""
+        self.update_action_count()
+        self.log(f"{message}，动作数: {len(self.actions)}, 时长: {self._recording_duration():.2f}秒")
+        self.edit_end_var.set(f"{self._recording_duration():.2f}")
+
+    def _run_edit(self, edit, message):
+        """执行编辑操作并处理错误"""
+        if self.is_recording or self.is_playing:
+            messagebox.showwarning("警告", "请先停止录制或播放！")
+            return
+        if self.is_analyzing:
+            messagebox.showwarning("警告", "请等待轨迹分析完成！")
+            return
+        try:
+            edit(self._editable_actions())
+        except Exception as e:
+            self.log(f"❌ 编辑失败: {e}")
+            messagebox.showerror("错误", f"编辑失败:\n{e}")
+            return
+        self._after_edit(message)
+
+    def edit_trim(self):
+        """裁剪"""
+        time_range = self._edit_range()
+        if time_range:
+            start, end = time_range
+            self._run_edit(lambda r: r.trim(start, end), f"✂️ 已裁剪到 {start:.2f}-{end:.2f}秒")
+
+    def edit_cut(self):
+        """剪切"""
+        time_range = self._edit_range()
+        if time_range:
+            start, end = time_range
+            self._run_edit(lambda r: r.cut(start, end), f"🗑️ 已删除 {start:.2f}-{end:.2f}秒")
+
+    def edit_retime(self):
+        """调速"""
+        time_range = self._edit_range()
+        if not time_range:
+            return
+        try:
+            factor = float(self.edit_factor_var.get())
+        except ValueError:
+            messagebox.showerror("错误", "请输入有效的时间倍率！")
+            return
+        start, end = time_range
+        self._run_edit(lambda r: r.retime(start, end, factor),
+                       f"⏱️ {start:.2f}-{end:.2f}秒 时间已乘以 {factor}")
+
+    def _ask_recording_file(self):
+        """选择要插入或追加的录制文件"""
+        filepath = filedialog.askopenfilename(
+            initialdir="recordings",
+            title="选择录制文件",
+            filetypes=RECORDING_FILETYPES
+        )
+        if not filepath:
+            return None, None
+        try:
+            return Path(filepath), self._read_actions(filepath)
+        except Exception as e:
+            self.log(f"❌ 加载失败: {e}")
+            messagebox.showerror("错误", f"加载失败:\n{e}")
+            return None, None
+
+    def edit_insert(self):
+        """插入其他录制"""
+        time_range = self._edit_range()
+        if not time_range:
+            return
+        filepath, actions = self._ask_recording_file()
+        if filepath:
+            start = time_range[0]
+            self._run_edit(lambda r: r.insert(start, actions),
+                           f"📥 已在 {start:.2f}秒 处插入 {filepath.name}")
+
+    def edit_concatenate(self):
+        """追加其他录制"""
+        filepath, actions = self._ask_recording_file()
+        if filepath:
+            self._run_edit(lambda r: r.concatenate(actions), f"➕ 已追加 {filepath.name}")
+
+    def edit_compact(self):
+        """压缩编辑结果为普通动作列表"""
+        if not isinstance(self.actions, EditableRecording):
+            self.log("🗜️ 录制未经编辑，无需压缩")
+            return
+        if self.is_analyzing:
+            messagebox.showwarning("警告", "请等待轨迹分析完成！")
+            return
+        self.actions = self.actions.compact()
+        self._after_edit("🗜️ 已压缩编辑结果")
+
     # ============ 设置功能 ============
 
     def toggle_loop(self):
         """切换循环模式"""
         self.loop_mode = self.loop_var.get()
+        if self.playback_worker:
+            self.playback_worker.set_loop(self.loop_mode)
         status = "开启" if self.loop_mode else "关闭"
         self.log(f"🔄 循环模式已{status}")
 
     def toggle_smooth(self):
         """切换平滑移动"""
         self.smooth_move = self.smooth_var.get()
+        if self.playback_worker:
+            self.playback_worker.set_smooth(self.smooth_move)
         status = "开启" if self.smooth_move else "关闭"
         self.log(f"🎬 平滑移动已{status}")
 
+    def toggle_process_playback(self):
+        """切换独立进程播放（下次播放时生效）"""
+        self.process_playback = self.process_var.get()
+        status = "开启" if self.process_playback else "关闭"
+        self.log(f"🧵 独立进程播放已{status}")
+
+    def _set_adaptive_sampling(self, enabled):
+        """切换采样模式（与钩子线程互斥；录制中关闭时先保留待定点）"""
+        with self._capture_lock:
+            if self.is_recording and self.adaptive_sampling and not enabled:
+                self._flush_move()
+            self.adaptive_sampling = enabled
+            self.move_filter.reset()
+
+    def toggle_adaptive(self):
+        """切换自适应采样"""
+        self._set_adaptive_sampling(self.adaptive_var.get())
+        status = "开启" if self.adaptive_sampling else "关闭（使用固定采样间隔）"
+        self.log(f"📐 自适应采样已{status}")
+
     def on_speed_change(self, event=None):
         """速度改变"""
         speed_str = self.speed_var.get()
         self.playback_speed = float(speed_str.replace('x', ''))
+        if self.playback_worker:
+            self.playback_worker.set_speed(self.playback_speed)
         self.log(f"⚡ 播放速度: {speed_str}")
 
     def on_threshold_change(self):
@@ -709,7 +1380,7 @@ class MouseRecorderGUI:
         move_count = sum(1 for a in self.actions if a['type'] == 'move')
         click_count = sum(1 for a in self.actions if a['type'] == 'click')
         scroll_count = sum(1 for a in self.actions if a['type'] == 'scroll')
-        duration = self.actions[-1]['time'] if self.actions else 0
+        duration = self._recording_duration()
 
         stats = f"""
 📊 录制统计信息
@@ -725,12 +1396,108 @@ class MouseRecorderGUI:
 平滑移动: {'开启' if self.smooth_move else '关闭'}
 播放速度: {self.playback_speed}x
 采样间隔: {self.move_threshold}秒
+自适应采样: {'开启' if self.adaptive_sampling else '关闭'}
 """
         messagebox.showinfo("统计信息", stats)
         self.log("📊 已显示统计信息")
 
+    def show_analytics(self):
+        """轨迹分析：热力图、停留区域、速度曲线"""
+        if not self.actions:
+            messagebox.showinfo("轨迹分析", "没有录制数据")
+            return
+
+        if self.is_recording:
+            messagebox.showwarning("警告", "请先停止录制！")
+            return
+        if self.is_analyzing:
+            self.log("⏳ 轨迹分析正在进行中...")
+            return
+
+        try:
+            import recording_analytics as analytics
+        except ImportError:
+            messagebox.showerror("错误", "轨迹分析需要安装 numpy:\npip install numpy")
+            return
+
+        if self.current_file:
+            stem = self.current_file.stem
+        else:
+            stem = f"recording_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+        self.is_analyzing = True
+        self.log("🔍 正在后台分析轨迹...")
+        if (len(self.actions) >= LARGE_RECORDING
+                and not isinstance(self.actions, analytics.RecordingArray)):
+            self.log("💡 大型录制可保存为 .npy 后重新加载，分析时无需逐条转换")
+        threading.Thread(
+            target=self._run_analytics,
+            args=(analytics, self.actions, stem),
+            daemon=True
+        ).start()
+
+    def _run_analytics(self, analytics, actions, stem):
+        """后台线程：转换、统计并渲染热力图，完成后回到 GUI 线程显示"""
+        try:
+            arr = analytics.actions_to_array(actions)
+            result = analytics.analyze(arr)
+
+            recordings_dir = Path("recordings")
+            recordings_dir.mkdir(exist_ok=True)
+            position_png = analytics.render_heatmap(
+                recordings_dir / f"{stem}_positions.png", result['position_heatmap'])
+            click_png = analytics.render_heatmap(
+                recordings_dir / f"{stem}_clicks.png", result['click_heatmap'])
+        except Exception as e:
+            self.root.after(0, lambda e=e: self._analytics_failed(e))
+            return
+        self.root.after(0, lambda: self._show_analytics_result(result, position_png, click_png))
+
+    def _analytics_failed(self, error):
+        """轨迹分析失败"""
+        self.is_analyzing = False
+        self.log(f"❌ 分析失败: {error}")
+        messagebox.showerror("错误", f"分析失败:\n{error}")
+
+    def _show_analytics_result(self, result, position_png, click_png):
+        """显示轨迹分析结果"""
+        self.is_analyzing = False
+        speed = result['speed']
+        self.log(f"🔥 热力图已保存: {position_png.name}, {click_png.name}")
+        if len(speed):
+            self.log(f"   平均速度: {speed.mean():.0f} 像素/秒, 最高速度: {speed.max():.0f} 像素/秒")
+        self.log(f"   停留区域: {len(result['dwell_seconds'])} 个")
+        for left, top, right, bottom, value in result['hot_click_areas'][:5]:
+            self.log(f"   点击热点 ({left:.0f}, {top:.0f})-({right:.0f}, {bottom:.0f}): {value:.0f} 次")
+
+        # 显示热力图
+        window = tk.Toplevel(self.root)
+        window.title("🔥 轨迹分析")
+        for text, png in (("位置热力图（按停留时间）", position_png), ("点击热力图", click_png)):
+            ttk.Label(window, text=text, font=('Arial', 9, 'bold')).pack(pady=(10, 5))
+            image = tk.PhotoImage(file=str(png))
+            label = ttk.Label(window, image=image)
+            label.image = image  # 保留引用，避免被回收
+            label.pack(padx=10)
+
+    def _on_first_expose(self, event):
+        """窗口首次绘制：稍后再启动热键监听，让本轮的重绘先完成
+
+        不调用 unbind：旧版本 tkinter 的 unbind(sequence, funcid) 会清除该事件的全部绑定
+        """
+        if self._first_exposed:
+            return
+        self._first_exposed = True
+        self.root.after(HOTKEY_START_DELAY_MS, self.start_hotkey_listener)
+
     def start_hotkey_listener(self):
         """启动全局热键监听"""
+        from pynput.keyboard import Key, Listener as KeyboardListener
+
+        self.hotkeys = {
+            Key.f7: self.toggle_recording,  # F7: 开始/停止录制
+            Key.f8: self.toggle_playback,   # F8: 开始/停止播放
+        }
         self.keyboard_listener = KeyboardListener(on_press=self._on_hotkey_press)
         self.keyboard_listener.start()
         self.log("🎹 全局热键已启用: F7-录制 F8-播放")
@@ -738,16 +1505,12 @@ class MouseRecorderGUI:
     def _on_hotkey_press(self, key):
         """热键按下处理"""
         try:
-            # F7: 开始/停止录制
-            if key == Key.f7:
-                self.root.after(0, self.toggle_recording)
-
-            # F8: 开始/停止播放
-            elif key == Key.f8:
-                self.root.after(0, self.toggle_playback)
+            callback = self.hotkeys.get(key)
+        except TypeError:
+            return
 
-        except AttributeError:
-            pass
+        if callback:
+            self.root.after(0, callback)
 
     def toggle_recording(self):
         """切换录制状态（热键调用）"""
@@ -772,6 +1535,9 @@ class MouseRecorderGUI:
             self.stop_recording()
         if self.is_playing:
             self.stop_playback()
+        if self.playback_worker:
+            self.playback_worker.close()
+            self.playback_worker = None
         # 停止键盘监听
         if self.keyboard_listener:
             self.keyboard_listener.stop()
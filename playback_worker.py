@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+独立进程播放 - 在子进程中回放录制
+避免 GUI 主循环、日志刷新和监听器回调的 GIL 竞争影响回放时间。
+录制打包进共享内存，子进程直接从共享内存读取（不复制）；
+播放/暂停/停止/跳转/速度等控制与播放进度通过共享内存中的数值传递，
+日志和错误通过单向管道回传。
+"""
+
+import multiprocessing as mp
+import struct
+import time
+from bisect import bisect_left
+from multiprocessing import shared_memory
+
+from action_format import (ACTION_FORMAT, BUTTON_CODES, TYPE_CLICK, TYPE_MOVE, TYPE_SCROLL,
+                           encode_action)
+
+
+# 动作记录的布局见 action_format，与 recording_analytics.ACTION_DTYPE 一致
+TIME_FORMAT = struct.Struct('<d')
+
+# 播放状态
+STATE_PLAYING = 0
+STATE_PAUSED = 1
+STATE_STOPPED = 2
+
+
+def pack_actions(actions):
+    """将动作列表打包进一块新的共享内存
+
+    Returns:
+        SharedMemory 对象（由调用方负责 close/unlink）
+    """
+    size = ACTION_FORMAT.size
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(actions) * size))
+    try:
+        buf = shm.buf
+        pack_into = ACTION_FORMAT.pack_into
+        for i, a in enumerate(actions):
+            pack_into(buf, i * size, *encode_action(a))
+    except Exception:
+        _release(shm)
+        raise
+    return shm
+
+
+def _release(shm):
+    """关闭并删除共享内存"""
+    shm.close()
+    shm.unlink()
+
+
+class _SharedTimes:
+    """按下标读取共享内存中各动作的时间，供 bisect 使用（不复制）"""
+
+    def __init__(self, buf, count):
+        self._buf = buf
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        return TIME_FORMAT.unpack_from(self._buf, index * ACTION_FORMAT.size)[0]
+
+
+class PlaybackWorker:
+    """独立播放进程的控制句柄（在 GUI 进程中使用）"""
+
+    def __init__(self, actions, speed=1.0, loop=False, smooth=True, move_steps=20,
+                 move_interval=0.01):
+        """
+        Args:
+            actions: 动作列表（或 EditableRecording）
+            speed: 播放速度
+            loop: 是否循环播放
+            smooth: 是否平滑移动
+            move_steps: 平滑移动的步数
+            move_interval: 回放移动轨迹时的插值间隔（秒）
+        """
+        ctx = mp.get_context('spawn')
+
+        self.count = len(actions)
+        self.duration = actions[-1]['time'] if self.count else 0.0
+        self._shm = pack_actions(actions)
+        try:
+            self._init_process(ctx, speed, loop, smooth, move_steps, move_interval)
+        except Exception:
+            # 子进程尚未创建，调用方拿不到句柄，只能在此释放共享内存
+            _release(self._shm)
+            raise
+
+    def _init_process(self, ctx, speed, loop, smooth, move_steps, move_interval):
+        """创建控制量、管道和（尚未启动的）播放进程"""
+        # 共享内存中的控制量（只由 GUI 进程写入，子进程只读，无需加锁）
+        self._state = ctx.RawValue('i', STATE_PLAYING)
+        self._speed = ctx.RawValue('d', speed)
+        # 跳转目标与序号：先写目标再递增序号，子进程记录已处理的序号，
+        # 不回写共享内存，处理期间的新跳转不会丢失
+        self._seek_target = ctx.RawValue('d', 0.0)
+        self._seek_seq = ctx.RawValue('q', 0)
+        self._loop = ctx.RawValue('b', loop)
+        self._smooth = ctx.RawValue('b', smooth)
+        # 子进程写入的进度
+        self._position = ctx.RawValue('q', 0)
+        self._current_time = ctx.RawValue('d', 0.0)
+
+        self._events, child_conn = ctx.Pipe(duplex=False)
+        controls = (self._state, self._speed, self._seek_target, self._seek_seq,
+                    self._loop, self._smooth, self._position, self._current_time)
+        self._process = ctx.Process(
+            target=_worker_main,
+            args=(self._shm.name, self.count, controls, child_conn, move_steps, move_interval),
+            daemon=True
+        )
+
+    def start(self):
+        """启动播放进程"""
+        self._process.start()
+
+    def pause(self):
+        """暂停"""
+        if self._state.value == STATE_PLAYING:
+            self._state.value = STATE_PAUSED
+
+    def resume(self):
+        """继续"""
+        if self._state.value == STATE_PAUSED:
+            self._state.value = STATE_PLAYING
+
+    def stop(self):
+        """停止"""
+        self._state.value = STATE_STOPPED
+
+    def seek(self, seconds):
+        """跳转到录制中的第 seconds 秒"""
+        self._seek_target.value = max(0.0, float(seconds))
+        self._seek_seq.value += 1
+
+    def set_speed(self, speed):
+        """设置播放速度"""
+        self._speed.value = speed
+
+    def set_loop(self, loop):
+        """设置循环播放"""
+        self._loop.value = loop
+
+    def set_smooth(self, smooth):
+        """设置平滑移动"""
+        self._smooth.value = smooth
+
+    @property
+    def progress(self):
+        """当前进度 (已执行动作数, 录制中的时间)"""
+        return self._position.value, self._current_time.value
+
+    def is_alive(self):
+        """播放进程是否仍在运行"""
+        return self._process.is_alive()
+
+    def poll_events(self):
+        """取出子进程发来的所有消息 [(kind, message), ...]"""
+        events = []
+        try:
+            while self._events.poll():
+                events.append(self._events.recv())
+        except (EOFError, OSError):
+            pass
+        return events
+
+    def close(self, timeout=1.0):
+        """停止播放进程并释放共享内存"""
+        self.stop()
+        if self._process.pid is not None:
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join(timeout)
+        self._events.close()
+        _release(self._shm)
+
+
+# ============ 子进程 ============
+
+def _worker_main(shm_name, count, controls, conn, move_steps, move_interval):
+    """播放进程入口"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        _Player(shm.buf, count, controls, conn, move_steps, move_interval).run()
+    except Exception as e:
+        conn.send(('error', f"播放进程异常: {e}"))
+    finally:
+        shm.close()
+        conn.close()
+
+
+class _Player:
+    """子进程中的播放器，时序与 GUI 线程中的 _execute_actions 一致"""
+
+    def __init__(self, buf, count, controls, conn, move_steps, move_interval):
+        from pynput.mouse import Button, Controller
+        from windows_input import WindowsMouseInput
+
+        self.buf = buf
+        self.count = count
+        self.times = _SharedTimes(buf, count)
+        (self.state, self.speed, self.seek_target, self.seek_seq,
+         self.loop, self.smooth, self.position, self.current_time) = controls
+        self.seek_handled = 0  # 已处理的跳转序号
+        self.conn = conn
+        self.move_steps = move_steps
+        self.move_interval = move_interval
+        self.paused_total = 0.0  # 累计暂停时长，插值移动时从已过时间中扣除
+        # 无法识别的按钮按左键处理，与 GUI 线程中的 _parse_button 一致
+        self.buttons = {code: getattr(Button, name) for name, code in BUTTON_CODES.items()}
+        self.default_button = Button.left
+        self.mouse_controller = Controller()
+        self.mouse_input = WindowsMouseInput()
+
+    def _stopped(self):
+        return self.state.value == STATE_STOPPED
+
+    def _interrupted(self):
+        """已停止或有待处理的跳转"""
+        return self.state.value == STATE_STOPPED or self.seek_seq.value != self.seek_handled
+
+    def _sleep(self, duration):
+        """可被停止、暂停和跳转打断的等待，返回 False 表示被打断"""
+        deadline = time.perf_counter() + duration
+        while True:
+            if self._interrupted():
+                return False
+            if self.state.value == STATE_PAUSED:
+                # 暂停期间不计入等待时间
+                paused_at = time.perf_counter()
+                while self.state.value == STATE_PAUSED:
+                    time.sleep(0.05)
+                paused = time.perf_counter() - paused_at
+                deadline += paused
+                self.paused_total += paused
+                continue
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return True
+            time.sleep(min(remaining, 0.05))
+
+    def run(self):
+        """执行动作序列"""
+        size = ACTION_FORMAT.size
+        unpack_from = ACTION_FORMAT.unpack_from
+
+        while True:
+            index = 0
+            prev_time = 0.0
+            prev_pos = None
+
+            while index < self.count:
+                if self._stopped():
+                    return
+
+                # 处理跳转
+                seq = self.seek_seq.value
+                if seq != self.seek_handled:
+                    # 读取序号后 GUI 若再次跳转，目标可能已是更新的值，下一轮会按新序号再处理一次
+                    self.seek_handled = seq
+                    target = self.seek_target.value
+                    index = bisect_left(self.times, target)
+                    prev_time = target
+                    prev_pos = None
+                    continue
+
+                t, type_code, button, pressed, x, y, dx, dy = unpack_from(self.buf, index * size)
+                time_diff = max(t - prev_time, 0) / self.speed.value
+
+                if type_code == TYPE_MOVE:
+                    # 在两个录制点之间按时间线性插值（暂停也在此处理）
+                    if not self._interpolate_move(prev_pos, x, y, time_diff):
+                        continue
+                # 等待时间间隔（暂停也在此处理）
+                elif not self._sleep(time_diff):
+                    continue
+                prev_time = t
+                prev_pos = (x, y)
+
+                try:
+                    if type_code == TYPE_CLICK:
+                        self._smooth_move_to(x, y, 0.15)
+                        mouse_button = self.buttons.get(button, self.default_button)
+                        if pressed:
+                            self.mouse_controller.press(mouse_button)
+                        else:
+                            self.mouse_controller.release(mouse_button)
+                    elif type_code == TYPE_SCROLL:
+                        self._smooth_move_to(x, y, 0.15)
+                        self.mouse_controller.scroll(dx, dy)
+                except Exception as e:
+                    self.conn.send(('error', f"执行失败: {e}"))
+
+                index += 1
+                self.position.value = index
+                self.current_time.value = t
+
+            if not self.loop.value or self._stopped():
+                return
+            self.conn.send(('loop', "循环播放..."))
+
+    def _interpolate_move(self, start, target_x, target_y, duration):
+        """在 duration 秒内从 start 匀速移动到目标位置，返回 False 表示被打断
+
+        与 GUI 线程中的 _interpolate_move 一致：按已经过的时间（扣除暂停）计算插值位置
+        """
+        if start is None or start == (target_x, target_y):
+            if not self._sleep(duration):
+                return False
+            self.mouse_input.move(target_x, target_y)
+            return True
+
+        start_x, start_y = start
+        distance_x = target_x - start_x
+        distance_y = target_y - start_y
+        started = time.perf_counter()
+        paused_before = self.paused_total
+        while True:
+            elapsed = time.perf_counter() - started - (self.paused_total - paused_before)
+            if elapsed >= duration:
+                break
+            progress = elapsed / duration
+            self.mouse_input.move(int(start_x + distance_x * progress),
+                                  int(start_y + distance_y * progress))
+            if not self._sleep(min(self.move_interval, duration - elapsed)):
+                return False
+        self.mouse_input.move(target_x, target_y)
+        return True
+
+    def _smooth_move_to(self, target_x, target_y, duration):
+        """平滑移动鼠标到目标位置"""
+        if not self.smooth.value:
+            self.mouse_input.move(target_x, target_y)
+            return
+
+        current_x, current_y = self.mouse_controller.position
+        distance_x = target_x - current_x
+        distance_y = target_y - current_y
+
+        # 如果距离很小，直接跳转
+        if abs(distance_x) < 5 and abs(distance_y) < 5:
+            self.mouse_input.move(target_x, target_y)
+            return
+
+        steps = self.move_steps
+        delay = max(duration / steps, 0.005)  # 至少5毫秒每步
+        for i in range(1, steps + 1):
+            if self._interrupted():
+                break
+            progress = i / steps
+            self.mouse_input.move(int(current_x + distance_x * progress),
+                                  int(current_y + distance_y * progress))
+            time.sleep(delay)
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+录制分析 - 基于 NumPy 的向量化统计
+热力图、停留区域、速度/加速度曲线、热点区域，并可渲染为 PNG
+"""
+
+import json
+import struct
+import zlib
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+from action_format import FIELDS, TYPE_CLICK, decode_action, encode_action
+
+
+# ============ 列式数据格式 ============
+
+# 每个动作一条定长记录，.npy 文件可直接 mmap，零拷贝得到各列
+# 布局与 action_format.ACTION_FORMAT 相同（独立播放进程的共享内存也使用此布局）
+ACTION_DTYPE = np.dtype([(name, '<' + code) for name, code in FIELDS])
+
+
+def actions_to_array(actions):
+    """将动作字典列表转换为结构化数组
+
+    Args:
+        actions: 录制器中的动作列表
+
+    Returns:
+        dtype 为 ACTION_DTYPE 的数组；RecordingArray 直接返回其数组，不做转换
+    """
+    if isinstance(actions, RecordingArray):
+        return actions.array
+    return np.array([encode_action(a) for a in actions], dtype=ACTION_DTYPE)
+
+
+class RecordingArray(Sequence):
+    """以结构化数组（可以是 mmap）为后端的只读动作序列
+
+    行为与动作字典列表一致（支持 len、下标、迭代），读取时才把单条记录还原为字典；
+    轨迹分析直接使用 array，无需逐条转换。
+    """
+
+    def __init__(self, array):
+        self.array = array
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return decode_action(self.array[index].item())
+
+    def __iter__(self):
+        for record in self.array:
+            yield decode_action(record.item())
+
+
+def save_binary(filepath, arr):
+    """保存为 .npy 二进制文件（可被 load_recording 以 mmap 方式打开）"""
+    if isinstance(arr, np.memmap) and Path(arr.filename).resolve() == Path(filepath).resolve():
+        # 覆盖正在映射的文件会截断映射（Linux 上读取时进程崩溃，Windows 上无法写入）
+        raise ValueError("不能覆盖当前已打开的 .npy 文件，请另存为其他文件")
+    np.save(filepath, np.ascontiguousarray(arr, dtype=ACTION_DTYPE))
+
+
+def load_recording(filepath):
+    """加载录制为结构化数组
+
+    .npy 文件以只读 mmap 方式打开，不会把整个文件读入内存；
+    .json 文件按录制器的保存格式解析。
+
+    Args:
+        filepath: 录制文件路径
+
+    Returns:
+        dtype 为 ACTION_DTYPE 的数组
+    """
+    filepath = Path(filepath)
+    if filepath.suffix.lower() == '.npy':
+        arr = np.load(filepath, mmap_mode='r')
+        if arr.dtype != ACTION_DTYPE:
+            raise ValueError(f"不支持的数据格式: {arr.dtype}")
+        return arr
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return actions_to_array(data.get('actions', []))
+
+
+# ============ 向量化统计 ============
+
+def _grid(arr, cell_size, bounds=None):
+    """计算网格原点与尺寸
+
+    Args:
+        bounds: (left, top, right, bottom) 统计范围（像素，right/bottom 不含），
+            默认取录制中坐标的范围
+
+    Returns:
+        ((left, top), (rows, cols))；原点向下对齐到 cell_size 的整数倍，
+        多显示器下的负坐标也会落在网格内
+    """
+    if bounds is None:
+        if len(arr):
+            bounds = (int(arr['x'].min()), int(arr['y'].min()),
+                      int(arr['x'].max()) + 1, int(arr['y'].max()) + 1)
+        else:
+            bounds = (0, 0, 1, 1)
+    left, top, right, bottom = bounds
+    left -= left % cell_size
+    top -= top % cell_size
+    shape = (max(1, -(-(bottom - top) // cell_size)), max(1, -(-(right - left) // cell_size)))
+    return (left, top), shape
+
+
+def _cell_index(x, y, origin, shape, cell_size):
+    """将坐标映射到扁平化的网格下标（超出范围的坐标会被截断到边缘）"""
+    left, top = origin
+    rows, cols = shape
+    col = np.clip((np.asarray(x, dtype=np.int64) - left) // cell_size, 0, cols - 1)
+    row = np.clip((np.asarray(y, dtype=np.int64) - top) // cell_size, 0, rows - 1)
+    return row * cols + col
+
+
+def _accumulate(index, shape, weights=None):
+    """按网格下标累加，返回 shape 大小的二维数组"""
+    rows, cols = shape
+    counts = np.bincount(index, weights=weights, minlength=rows * cols)
+    return counts.reshape(shape)
+
+
+def click_heatmap(arr, cell_size=20, bounds=None):
+    """点击热力图（只统计按下事件）
+
+    Returns:
+        每个网格的点击次数，形状为 (rows, cols)；网格原点见 _grid
+    """
+    origin, shape = _grid(arr, cell_size, bounds)
+    mask = (arr['type'] == TYPE_CLICK) & (arr['pressed'] == 1)
+    index = _cell_index(arr['x'][mask], arr['y'][mask], origin, shape, cell_size)
+    return _accumulate(index, shape)
+
+
+def dwell_times(arr, cells):
+    """每个动作所在网格停留的时间
+
+    只有下一个动作仍在同一网格时才计入两者的时间差，
+    自适应采样的两个点之间是移动而非停留，跨网格的时间差不计入。
+
+    Args:
+        cells: 每个动作所在的网格下标（见 _cell_index）
+
+    Returns:
+        每个动作的停留秒数（最后一个为 0）
+    """
+    times = arr['time']
+    dwell = np.zeros(len(arr), dtype=np.float64)
+    if len(arr) > 1:
+        np.subtract(times[1:], times[:-1], out=dwell[:-1])
+        np.maximum(dwell, 0, out=dwell)
+        dwell[:-1][cells[1:] != cells[:-1]] = 0
+    return dwell
+
+
+def position_heatmap(arr, cell_size=20, bounds=None):
+    """位置热力图，按停留时间加权
+
+    Returns:
+        每个网格累计停留的秒数，形状为 (rows, cols)；网格原点见 _grid
+    """
+    origin, shape = _grid(arr, cell_size, bounds)
+    index = _cell_index(arr['x'], arr['y'], origin, shape, cell_size)
+    return _accumulate(index, shape, weights=dwell_times(arr, index))
+
+
+def dwell_regions(heatmap, min_dwell=1.0):
+    """停留区域：累计停留时间不少于 min_dwell 秒的网格
+
+    Args:
+        heatmap: position_heatmap 的结果
+        min_dwell: 最短累计停留时间（秒）
+
+    Returns:
+        (rows, cols, seconds) 三个数组，按停留时间降序排列
+    """
+    rows, cols = np.nonzero(heatmap >= min_dwell)
+    seconds = heatmap[rows, cols]
+    order = np.argsort(seconds)[::-1]
+    return rows[order], cols[order], seconds[order]
+
+
+def hot_areas(heatmap, top=10, cell_size=20, origin=(0, 0)):
+    """热点区域：取热力图中数值最大的 top 个网格
+
+    Args:
+        origin: 网格原点的屏幕坐标（analyze 结果中的 'origin'）
+
+    Returns:
+        形状为 (n, 5) 的数组，每行为 (left, top, right, bottom, value)，坐标为屏幕坐标
+    """
+    flat = heatmap.ravel()
+    top = min(top, np.count_nonzero(flat))
+    if top == 0:
+        return np.empty((0, 5))
+
+    index = np.argpartition(flat, -top)[-top:]
+    index = index[np.argsort(flat[index])[::-1]]
+    rows, cols = np.unravel_index(index, heatmap.shape)
+    left = origin[0] + cols * cell_size
+    upper = origin[1] + rows * cell_size
+    return np.column_stack([left, upper, left + cell_size, upper + cell_size, flat[index]])
+
+
+def motion_profile(arr):
+    """速度/加速度曲线（基于所有带坐标的动作）
+
+    Returns:
+        (times, speed, acceleration)，速度单位为像素/秒，加速度为像素/秒²；
+        times 为每段的中点时刻，时间差为 0 的段会被丢弃
+    """
+    t = np.asarray(arr['time'], dtype=np.float64)
+    x = np.asarray(arr['x'], dtype=np.float64)
+    y = np.asarray(arr['y'], dtype=np.float64)
+    if len(t) < 2:
+        return np.empty(0), np.empty(0), np.empty(0)
+
+    dt = np.diff(t)
+    valid = dt > 0
+    dist = np.hypot(np.diff(x), np.diff(y))[valid]
+    dt = dt[valid]
+    mid = (t[:-1][valid] + t[1:][valid]) / 2
+    speed = dist / dt
+
+    acceleration = np.zeros_like(speed)
+    if len(speed) > 1:
+        dmid = np.diff(mid)
+        np.divide(np.diff(speed), dmid, out=acceleration[1:], where=dmid > 0)
+    return mid, speed, acceleration
+
+
+def analyze(arr, cell_size=20, bounds=None, min_dwell=1.0, top=10):
+    """计算全部统计结果
+
+    Returns:
+        包含各项结果数组的字典；两张热力图共用同一网格，原点为 'origin'
+    """
+    origin, shape = _grid(arr, cell_size, bounds)
+    bounds = (origin[0], origin[1],
+              origin[0] + shape[1] * cell_size, origin[1] + shape[0] * cell_size)
+    clicks = click_heatmap(arr, cell_size, bounds)
+    positions = position_heatmap(arr, cell_size, bounds)
+    dwell_rows, dwell_cols, dwell_seconds = dwell_regions(positions, min_dwell)
+    times, speed, acceleration = motion_profile(arr)
+    return {
+        'cell_size': cell_size,
+        'origin': origin,
+        'click_heatmap': clicks,
+        'position_heatmap': positions,
+        'dwell_rows': dwell_rows,
+        'dwell_cols': dwell_cols,
+        'dwell_seconds': dwell_seconds,
+        'hot_click_areas': hot_areas(clicks, top, cell_size, origin),
+        'hot_position_areas': hot_areas(positions, top, cell_size, origin),
+        'times': times,
+        'speed': speed,
+        'acceleration': acceleration,
+    }
+
+
+# ============ PNG 渲染 ============
+
+def _colormap(values):
+    """把 0-1 的数值映射为 RGB（黑 → 红 → 黄 → 白）"""
+    r = np.clip(values * 3, 0, 1)
+    g = np.clip(values * 3 - 1, 0, 1)
+    b = np.clip(values * 3 - 2, 0, 1)
+    return (np.stack([r, g, b], axis=-1) * 255).astype(np.uint8)
+
+
+def _write_png(filepath, rgb):
+    """将 (h, w, 3) 的 uint8 数组写为 PNG（不依赖图像库）"""
+    height, width, _ = rgb.shape
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = rgb.reshape(height, width * 3)
+
+    def chunk(tag, data):
+        body = tag + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body) & 0xffffffff)
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    with open(filepath, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', header))
+        f.write(chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)))
+        f.write(chunk(b'IEND', b''))
+
+
+def render_heatmap(filepath, heatmap, scale=4, log_scale=True):
+    """将热力图渲染为 PNG
+
+    Args:
+        filepath: 输出文件路径
+        heatmap: 二维数组
+        scale: 每个网格放大的像素数
+        log_scale: 是否使用对数刻度（避免少数热点压暗其余区域）
+    """
+    values = np.log1p(heatmap) if log_scale else np.asarray(heatmap, dtype=np.float64)
+    peak = values.max() if values.size else 0
+    if peak > 0:
+        values = values / peak
+    rgb = _colormap(values)
+    if scale > 1:
+        rgb = rgb.repeat(scale, axis=0).repeat(scale, axis=1)
+    _write_png(filepath, rgb)
+    return Path(filepath)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+录制编辑 - 基于分块的裁剪、剪切、插入、拼接与调速
+编辑只修改分块的元数据（动作下标范围 + 时间基准），不重写动作本身
+"""
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+
+
+class _Source:
+    """一份不可变的原始动作列表"""
+
+    def __init__(self, actions):
+        self.actions = actions
+        self.times = [a['time'] for a in actions]
+
+
+class Chunk:
+    """分块：引用原始动作 [lo, hi)，覆盖原始时间 [src_from, src_to]
+
+    原始时间 t 映射到编辑后的时间为 start + (t - src_from) * scale
+    """
+
+    __slots__ = ('source', 'lo', 'hi', 'src_from', 'src_to', 'start', 'scale')
+
+    def __init__(self, source, lo, hi, src_from, src_to, start=0.0, scale=1.0):
+        self.source = source
+        self.lo = lo
+        self.hi = hi
+        self.src_from = src_from
+        self.src_to = src_to
+        self.start = start
+        self.scale = scale
+
+    @property
+    def span(self):
+        """编辑后的时长"""
+        return (self.src_to - self.src_from) * self.scale
+
+    @property
+    def end(self):
+        """编辑后的结束时间"""
+        return self.start + self.span
+
+    def map_time(self, t):
+        """原始时间 → 编辑后的时间"""
+        return self.start + (t - self.src_from) * self.scale
+
+    def to_source_time(self, t):
+        """编辑后的时间 → 原始时间"""
+        return self.src_from + (t - self.start) / self.scale
+
+    def copy(self, start=None):
+        """复制分块（可指定新的起始时间）"""
+        return Chunk(self.source, self.lo, self.hi, self.src_from, self.src_to,
+                     self.start if start is None else start, self.scale)
+
+    def split(self, t, after=False):
+        """在编辑后的时间 t 处一分为二
+
+        after 为 False 时恰好在 t 的动作归右侧，为 True 时归左侧
+        """
+        src_t = min(max(self.to_source_time(t), self.src_from), self.src_to)
+        bisect = bisect_right if after else bisect_left
+        index = bisect(self.source.times, src_t, self.lo, self.hi)
+        left = Chunk(self.source, self.lo, index, self.src_from, src_t, self.start, self.scale)
+        right = Chunk(self.source, index, self.hi, src_t, self.src_to, t, self.scale)
+        return left, right
+
+
+class EditableRecording(Sequence):
+    """可编辑的录制
+
+    以分块列表表示，行为与动作字典列表一致（支持 len、下标、迭代），
+    读取时按分块的时间基准即时计算每个动作的时间。
+    所有编辑操作的开销只与分块数量有关，与动作数量无关。
+    时间范围 [start, end] 均为闭区间，恰好在 start 或 end 的动作也在范围内。
+    """
+
+    def __init__(self, chunks=None):
+        self.chunks = chunks or []
+        self._reindex()
+
+    @classmethod
+    def from_actions(cls, actions):
+        """由动作列表创建（不复制动作）"""
+        if isinstance(actions, EditableRecording):
+            return cls([c.copy() for c in actions.chunks])
+        if not actions:
+            return cls()
+        source = _Source(actions)
+        return cls([Chunk(source, 0, len(actions), 0.0, source.times[-1])])
+
+    def _reindex(self):
+        """重建各分块的起始下标"""
+        self._offsets = []
+        total = 0
+        for chunk in self.chunks:
+            self._offsets.append(total)
+            total += chunk.hi - chunk.lo
+        self._length = total
+
+    # ============ 序列接口 ============
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("动作下标超出范围")
+
+        # 空分块与下一个分块起始下标相同，bisect_right 会落在后者上
+        chunk_index = bisect_right(self._offsets, index) - 1
+        chunk = self.chunks[chunk_index]
+        action = chunk.source.actions[chunk.lo + index - self._offsets[chunk_index]]
+        return dict(action, time=chunk.map_time(action['time']))
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            actions = chunk.source.actions
+            for i in range(chunk.lo, chunk.hi):
+                action = actions[i]
+                yield dict(action, time=chunk.map_time(action['time']))
+
+    @property
+    def duration(self):
+        """编辑后的总时长"""
+        return self.chunks[-1].end if self.chunks else 0.0
+
+    # ============ 编辑操作 ============
+
+    def _split_at(self, t, after=False):
+        """确保 t 处是分块边界，返回边界处的分块下标
+
+        after 为 False 时边界在 t 处的动作之前，为 True 时在其之后
+        """
+        for i, chunk in enumerate(self.chunks):
+            if after:
+                if t < chunk.start:
+                    return i
+                inside = t < chunk.end
+            else:
+                if t <= chunk.start:
+                    return i
+                inside = t <= chunk.end
+            if inside:
+                self.chunks[i:i + 1] = chunk.split(t, after)
+                return i + 1
+        return len(self.chunks)
+
+    def _shift(self, first, delta):
+        """将 first 及之后的分块整体平移 delta 秒"""
+        for chunk in self.chunks[first:]:
+            chunk.start += delta
+
+    def _clamp_range(self, start, end):
+        """将时间范围限制在录制内"""
+        start = max(0.0, start)
+        end = min(self.duration, end)
+        if end <= start:
+            raise ValueError("时间范围无效")
+        return start, end
+
+    def trim(self, start, end):
+        """裁剪：只保留 [start, end]，并将起点移到 0"""
+        start, end = self._clamp_range(start, end)
+        first = self._split_at(start)
+        last = self._split_at(end, after=True)
+        self.chunks = self.chunks[first:last]
+        self._shift(0, -start)
+        self._reindex()
+
+    def cut(self, start, end):
+        """剪切：删除 [start, end]，之后的动作提前 end - start 秒"""
+        start, end = self._clamp_range(start, end)
+        first = self._split_at(start)
+        last = self._split_at(end, after=True)
+        del self.chunks[first:last]
+        self._shift(first, start - end)
+        self._reindex()
+
+    def insert(self, t, other):
+        """插入：在 t 秒处插入另一段录制，t 及之后的动作推迟其时长"""
+        other = EditableRecording.from_actions(other)
+        if not other.chunks:
+            return
+        t = min(max(0.0, t), self.duration)
+        index = self._split_at(t)
+        inserted = [c.copy(start=c.start + t) for c in other.chunks]
+        self.chunks[index:index] = inserted
+        self._shift(index + len(inserted), other.duration)
+        self._reindex()
+
+    def concatenate(self, other, gap=0.0):
+        """拼接：在末尾追加另一段录制，中间间隔 gap 秒"""
+        other = EditableRecording.from_actions(other)
+        offset = self.duration + gap
+        self.chunks.extend(c.copy(start=c.start + offset) for c in other.chunks)
+        self._reindex()
+
+    def retime(self, start, end, factor):
+        """调速：[start, end] 内的时间间隔乘以 factor，之后的动作随之平移"""
+        if factor <= 0:
+            raise ValueError("时间倍率必须大于 0")
+        start, end = self._clamp_range(start, end)
+        first = self._split_at(start)
+        last = self._split_at(end, after=True)
+        for chunk in self.chunks[first:last]:
+            chunk.start = start + (chunk.start - start) * factor
+            chunk.scale *= factor
+        self._shift(last, (end - start) * (factor - 1))
+        self._reindex()
+
+    def compact(self):
+        """压缩：将所有分块合并为一份新的动作列表"""
+        actions = list(self)
+        duration = self.duration
+        if not actions:
+            self.chunks = []
+        else:
+            source = _Source(actions)
+            self.chunks = [Chunk(source, 0, len(actions), 0.0, duration)]
+        self._reindex()
+        return actions
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动性能测试
+冷启动到首帧的时间、热键监听就绪时间，以及 SendInput 单次调用开销
+"""
+
+import argparse
+import ctypes
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+# 子进程中执行：从解释器启动到窗口首次绘制完成
+# 首帧以首个 <Expose> 事件及随后的重绘为准（wait_visibility 会执行同一轮空闲处理，
+# 无法区分首帧与之后才执行的回调）
+CHILD_SCRIPT = r"""
+import json, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+
+import tkinter as tk
+import mouse_recorder_gui as gui
+t_import = time.perf_counter()
+
+root = tk.Tk()
+app = gui.MouseRecorderGUI(root)
+exposed = []
+root.bind('<Expose>', lambda event: exposed.append(event), add='+')
+while not exposed and time.perf_counter() - t_import < 10:
+    root.update()
+root.update_idletasks()  # 完成首个 <Expose> 触发的重绘
+t_frame = time.perf_counter()
+
+# 等待延迟启动的热键监听
+while app.keyboard_listener is None and time.perf_counter() - t_frame < 10:
+    root.update()
+t_listener = time.perf_counter()
+
+app.on_closing()
+print(json.dumps({{
+    'import': t_import - t0,
+    'first_frame': t_frame - t0,
+    'listener': t_listener - t0,
+}}))
+"""
+
+
+def measure_cold_start(runs):
+    """多次冷启动，返回各阶段耗时（秒）的列表"""
+    root = str(Path(__file__).resolve().parent)
+    script = CHILD_SCRIPT.format(root=root)
+    results = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, '-c', script],
+            capture_output=True, text=True, check=True
+        ).stdout
+        wall = time.perf_counter() - started
+        result = json.loads(output.strip().splitlines()[-1])
+        result['process'] = wall
+        results.append(result)
+    return results
+
+
+def measure_injection(calls):
+    """比较每次解析函数的旧调用方式与预先绑定的调用方式（仅 Windows）
+
+    鼠标移动到当前位置，不会改变光标位置。
+    """
+    from ctypes import wintypes
+    import windows_input as win
+
+    point = wintypes.POINT()
+    ctypes.windll.user32.GetCursorPos(ctypes.byref(point))
+    x, y = point.x, point.y
+
+    def unbound_move():
+        screen_width = ctypes.windll.user32.GetSystemMetrics(0)
+        screen_height = ctypes.windll.user32.GetSystemMetrics(1)
+        mi = win.MOUSEINPUT(
+            dx=int(x * 65535 / screen_width),
+            dy=int(y * 65535 / screen_height),
+            mouseData=0,
+            dwFlags=win.MOUSEEVENTF_MOVE | win.MOUSEEVENTF_ABSOLUTE,
+            time=0,
+            dwExtraInfo=None
+        )
+        input_event = win.INPUT(type=win.INPUT_MOUSE, mi=mi)
+        ctypes.windll.user32.SendInput(1, ctypes.byref(input_event), ctypes.sizeof(win.INPUT))
+
+    mouse_input = win.WindowsMouseInput()
+
+    def bound_move():
+        mouse_input.move(x, y)
+
+    results = {}
+    for name, move in (('unbound', unbound_move), ('bound', bound_move)):
+        started = time.perf_counter()
+        for _ in range(calls):
+            move()
+        results[name] = (time.perf_counter() - started) / calls
+    return results
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="启动性能测试")
+    parser.add_argument('--runs', type=int, default=5, help="冷启动次数")
+    parser.add_argument('--calls', type=int, default=2000, help="SendInput 调用次数")
+    args = parser.parse_args()
+
+    print(f"🚀 冷启动（{args.runs} 次，取中位数）")
+    results = measure_cold_start(args.runs)
+    for key, label in (('import', "导入模块"),
+                       ('first_frame', "首帧可见"),
+                       ('listener', "热键监听就绪"),
+                       ('process', "进程总耗时")):
+        values = [r[key] * 1000 for r in results]
+        print(f"   {label}: {statistics.median(values):.1f} ms "
+              f"(最小 {min(values):.1f}, 最大 {max(values):.1f})")
+
+    print(f"\n🖱️  SendInput 单次调用开销（{args.calls} 次）")
+    if sys.platform != 'win32':
+        print("   跳过：仅支持 Windows")
+        return
+
+    injection = measure_injection(args.calls)
+    print(f"   每次解析函数: {injection['unbound'] * 1e6:.2f} µs")
+    print(f"   预先绑定:     {injection['bound'] * 1e6:.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""动作二进制格式在播放进程与轨迹分析之间保持一致"""
+
+import pytest
+
+from action_format import ACTION_FORMAT, BUTTON_NONE, TYPE_CLICK, button_code, encode_action
+from playback_worker import pack_actions
+
+
+ACTIONS = [
+    {'type': 'move', 'x': -10, 'y': 20, 'time': 0.5},
+    {'type': 'click', 'x': 3, 'y': 4, 'button': 'Button.right', 'pressed': True, 'time': 1.0},
+    {'type': 'scroll', 'x': 3, 'y': 4, 'dx': 0, 'dy': -2, 'time': 1.5},
+]
+
+
+def test_button_code():
+    assert button_code('Button.middle') == 3
+    assert button_code('Button.x1') == BUTTON_NONE
+
+
+def test_pack_actions_round_trip():
+    shm = pack_actions(ACTIONS)
+    try:
+        records = [ACTION_FORMAT.unpack_from(shm.buf, i * ACTION_FORMAT.size)
+                   for i in range(len(ACTIONS))]
+    finally:
+        shm.close()
+        shm.unlink()
+    assert records == [encode_action(a) for a in ACTIONS]
+    assert records[1][1:4] == (TYPE_CLICK, 2, 1)
+
+
+def test_numpy_layout_matches_struct():
+    np = pytest.importorskip('numpy')
+    import recording_analytics as analytics
+
+    assert analytics.ACTION_DTYPE.itemsize == ACTION_FORMAT.size
+    arr = analytics.actions_to_array(ACTIONS)
+    packed = b''.join(ACTION_FORMAT.pack(*encode_action(a)) for a in ACTIONS)
+    assert arr.tobytes() == packed
+    assert np.frombuffer(packed, dtype=analytics.ACTION_DTYPE)['dy'].tolist() == [0, 0, -2]
@@ -0,0 +1,83 @@
+"""AdaptiveMoveFilter 的保留规则与回放误差"""
+
+import math
+
+from mouse_recorder_gui import AdaptiveMoveFilter
+
+
+def sample(points):
+    """用过滤器采样 [(x, y, t), ...]，停止录制时 flush"""
+    move_filter = AdaptiveMoveFilter()
+    kept = [p for p in (move_filter.feed(*point) for point in points) if p]
+    last = move_filter.flush()
+    if last:
+        kept.append(last)
+    return kept
+
+
+def max_error(points, kept):
+    """原始点与保留点之间按时间线性插值（即回放轨迹）的最大距离"""
+    worst = 0.0
+    j = 0
+    for x, y, t in points:
+        while j + 1 < len(kept) - 1 and kept[j + 1][2] <= t:
+            j += 1
+        (ax, ay, at), (bx, by, bt) = kept[j], kept[j + 1]
+        progress = (t - at) / (bt - at) if bt > at else 1.0
+        progress = min(max(progress, 0.0), 1.0)
+        worst = max(worst, math.hypot(ax + (bx - ax) * progress - x,
+                                      ay + (by - ay) * progress - y))
+    return worst
+
+
+def test_first_point_is_kept():
+    move_filter = AdaptiveMoveFilter()
+    assert move_filter.feed(10, 20, 0.0) == (10, 20, 0.0)
+
+
+def test_flush_returns_pending_point_once():
+    move_filter = AdaptiveMoveFilter()
+    move_filter.feed(0, 0, 0.0)
+    assert move_filter.feed(1, 0, 0.01) is None
+    assert move_filter.flush() == (1, 0, 0.01)
+    assert move_filter.flush() is None
+
+
+def test_straight_line_keeps_only_max_interval_points():
+    points = [(i * 2, i, i * 0.008) for i in range(250)]  # 2 秒匀速直线
+    kept = sample(points)
+    assert kept[0] == points[0] and kept[-1] == points[-1]
+    gaps = [b[2] - a[2] for a, b in zip(kept, kept[1:])]
+    assert all(gap <= 0.5 for gap in gaps)
+    assert len(kept) <= 6
+    assert max_error(points, kept) < 1.0
+
+
+def test_corner_is_kept():
+    points = [(i * 4, 0, i * 0.008) for i in range(26)]
+    points += [(100, i * 4, 0.2 + i * 0.008) for i in range(1, 26)]
+    kept = sample(points)
+    assert (100, 0, 0.2) in kept
+    assert max_error(points, kept) < 1.0
+
+
+def test_circle_error_close_to_tolerance():
+    # 125 Hz 采样、半径 200 像素、2 秒一圈
+    points = []
+    for i in range(250):
+        t = i * 0.008
+        angle = math.pi * t
+        points.append((round(500 + 200 * math.cos(angle)),
+                       round(500 + 200 * math.sin(angle)), t))
+    kept = sample(points)
+    assert len(kept) < len(points) / 3
+    # 误差容限只在检查点上检验，允许略微超出
+    assert max_error(points, kept) < 2 * AdaptiveMoveFilter().tolerance
+
+
+def test_stationary_keeps_nothing_until_max_interval():
+    move_filter = AdaptiveMoveFilter()
+    move_filter.feed(50, 50, 0.0)
+    for i in range(1, 50):
+        assert move_filter.feed(50, 50, i * 0.008) is None
+    assert move_filter.feed(50, 50, 0.6) == (50, 50, 49 * 0.008)
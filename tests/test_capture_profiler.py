@@ -0,0 +1,124 @@
+"""CaptureProfiler 的统计与预算判断"""
+
+import pytest
+
+import capture_profiler
+from capture_profiler import CallbackStats, CaptureProfiler
+
+
+class FakeClock:
+    """可手动推进的 perf_counter"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(capture_profiler.time, 'perf_counter', fake)
+    return fake
+
+
+def timed(profiler, clock, name, seconds):
+    """返回一个执行时推进 clock 指定秒数的被包装回调"""
+    def callback():
+        clock.now += seconds
+    return profiler.wrap(name, callback)
+
+
+def test_ring_buffer_rollover():
+    stats = CallbackStats(window=4)
+    for elapsed in (1.0, 2.0, 3.0, 4.0, 5.0, 6.0):
+        stats.record(elapsed)
+    assert stats.count == 6
+    assert stats.total == pytest.approx(21.0)
+    assert stats.max == 6.0
+    assert sorted(stats.recent()) == [3.0, 4.0, 5.0, 6.0]
+    assert stats.percentile(50) == 5.0
+    assert stats.percentile(99) == 6.0
+
+
+def test_percentile_without_samples():
+    assert CallbackStats(window=4).percentile(99) == 0.0
+
+
+def test_wrap_keeps_return_value():
+    profiler = CaptureProfiler()
+    wrapped = profiler.wrap('move', lambda x, y: False)
+    assert wrapped(1, 2) is False
+    assert profiler.move_events == 1
+
+
+def test_tick_rates_and_keep_ratio(clock):
+    profiler = CaptureProfiler()
+    on_move = timed(profiler, clock, 'move', 0.0)
+    for _ in range(200):
+        on_move()
+    for _ in range(50):
+        profiler.count_kept()
+
+    clock.now += 2.0
+    snapshot = profiler.tick()
+    assert snapshot['move_events'] == 200
+    assert snapshot['kept_moves'] == 50
+    assert snapshot['keep_ratio'] == pytest.approx(0.25)
+    assert snapshot['event_rate'] == pytest.approx(100.0)
+    assert snapshot['kept_rate'] == pytest.approx(25.0)
+
+    # 速率只统计两次 tick 之间的事件
+    for _ in range(10):
+        on_move()
+    clock.now += 1.0
+    snapshot = profiler.tick()
+    assert snapshot['event_rate'] == pytest.approx(10.0)
+    assert snapshot['kept_rate'] == 0.0
+    assert len(profiler.history) == 2
+
+
+def test_queue_depth():
+    profiler = CaptureProfiler()
+    for _ in range(3):
+        profiler.enqueued()
+    profiler.dequeued()
+    assert profiler.queue_depth == 2
+    profiler.enqueued()
+    profiler.dequeued()
+    profiler.dequeued()
+    assert profiler.queue_depth == 1
+    assert profiler.max_queue_depth == 3
+
+
+def test_over_budget_needs_enough_samples(clock):
+    profiler = CaptureProfiler(budget_ms=1.0, min_samples=100)
+    on_move = timed(profiler, clock, 'move', 0.0001)
+    for _ in range(5000):
+        on_move()
+    # 一次冷启动的慢点击不足以判定超出预算
+    timed(profiler, clock, 'click', 0.002)()
+    assert profiler.over_budget() == []
+
+
+def test_over_budget_with_slow_tail(clock):
+    profiler = CaptureProfiler(budget_ms=1.0, min_samples=100)
+    fast = timed(profiler, clock, 'move', 0.0001)
+    slow = timed(profiler, clock, 'move', 0.005)
+    for i in range(200):
+        (slow if i % 20 == 0 else fast)()
+    assert profiler.over_budget() == ['move']
+
+
+def test_reset_clears_session(clock):
+    profiler = CaptureProfiler()
+    timed(profiler, clock, 'move', 0.001)()
+    profiler.count_kept()
+    profiler.enqueued()
+    profiler.tick()
+    profiler.reset()
+    assert profiler.move_events == 0
+    assert profiler.kept_moves == 0
+    assert profiler.queue_depth == 0
+    assert profiler.history == []
@@ -0,0 +1,30 @@
+"""独立播放进程的控制量与依赖"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from playback_worker import PlaybackWorker
+
+
+ACTIONS = [{'type': 'move', 'x': i, 'y': 0, 'time': i * 0.1} for i in range(10)]
+
+
+def test_seek_is_sequenced():
+    worker = PlaybackWorker(ACTIONS)
+    try:
+        assert worker._seek_seq.value == 0
+        worker.seek(0.5)
+        worker.seek(-1)
+        # 目标保留最后一次跳转，序号记录跳转次数，子进程只读不回写
+        assert worker._seek_seq.value == 2
+        assert worker._seek_target.value == 0.0
+    finally:
+        worker.close()
+
+
+def test_worker_does_not_import_gui():
+    root = Path(__file__).resolve().parent.parent
+    code = ("import sys; import playback_worker, windows_input; "
+            "assert 'tkinter' not in sys.modules and 'mouse_recorder_gui' not in sys.modules")
+    subprocess.run([sys.executable, '-c', code], cwd=root, check=True)
@@ -0,0 +1,78 @@
+"""recording_analytics 的热力图与停留时间"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import recording_analytics as analytics  # noqa: E402
+
+
+def make_actions():
+    """在 (5, 5) 停留 2 秒，移动到 (45, 5) 停留 1 秒，再移到 (-15, 25) 点击"""
+    return [
+        {'type': 'move', 'x': 5, 'y': 5, 'time': 0.0},
+        {'type': 'move', 'x': 6, 'y': 5, 'time': 1.0},
+        {'type': 'move', 'x': 5, 'y': 6, 'time': 2.0},
+        {'type': 'move', 'x': 45, 'y': 5, 'time': 2.5},
+        {'type': 'move', 'x': 46, 'y': 5, 'time': 3.5},
+        {'type': 'move', 'x': -15, 'y': 25, 'time': 4.0},
+        {'type': 'click', 'x': -15, 'y': 25, 'button': 'Button.left', 'pressed': True, 'time': 4.5},
+        {'type': 'click', 'x': -15, 'y': 25, 'button': 'Button.left', 'pressed': False, 'time': 4.6},
+    ]
+
+
+def test_grid_origin_covers_negative_coordinates():
+    arr = analytics.actions_to_array(make_actions())
+    origin, shape = analytics._grid(arr, 20)
+    assert origin == (-20, 0)
+    assert shape == (2, 4)  # x: -20..60, y: 0..40
+
+
+def test_dwell_only_counts_same_cell():
+    arr = analytics.actions_to_array(make_actions())
+    origin, shape = analytics._grid(arr, 20)
+    cells = analytics._cell_index(arr['x'], arr['y'], origin, shape, 20)
+    dwell = analytics.dwell_times(arr, cells)
+    # 跨网格移动的 0.5 秒与 0.5 秒不计入
+    np.testing.assert_allclose(dwell, [1.0, 1.0, 0.0, 1.0, 0.0, 0.5, 0.1, 0.0])
+
+
+def test_position_heatmap():
+    arr = analytics.actions_to_array(make_actions())
+    heatmap = analytics.position_heatmap(arr, 20)
+    expected = np.zeros((2, 4))
+    expected[0, 1] = 2.0   # (5, 5) 附近
+    expected[0, 3] = 1.0   # (45, 5) 附近
+    expected[1, 0] = 0.6   # (-15, 25)
+    np.testing.assert_allclose(heatmap, expected)
+
+
+def test_click_heatmap_and_hot_areas():
+    result = analytics.analyze(analytics.actions_to_array(make_actions()), cell_size=20)
+    clicks = result['click_heatmap']
+    assert clicks.sum() == 1 and clicks[1, 0] == 1
+    np.testing.assert_array_equal(result['hot_click_areas'], [[-20, 20, 0, 40, 1]])
+    left, top, right, bottom, seconds = result['hot_position_areas'][0]
+    assert (left, top, right, bottom) == (0, 0, 20, 20) and seconds == pytest.approx(2.0)
+
+
+def test_empty_recording():
+    result = analytics.analyze(analytics.actions_to_array([]))
+    assert result['click_heatmap'].shape == (1, 1)
+    assert len(result['hot_click_areas']) == 0
+
+
+def test_npy_round_trip_is_zero_copy(tmp_path):
+    actions = make_actions()
+    filepath = tmp_path / 'recording.npy'
+    analytics.save_binary(filepath, analytics.actions_to_array(actions))
+
+    recording = analytics.RecordingArray(analytics.load_recording(filepath))
+    assert isinstance(recording.array, np.memmap)
+    assert analytics.actions_to_array(recording) is recording.array
+    assert len(recording) == len(actions)
+    assert list(recording) == actions
+    assert recording[-1] == actions[-1]
+
+    with pytest.raises(ValueError):
+        analytics.save_binary(filepath, recording.array)
@@ -0,0 +1,96 @@
+"""EditableRecording 的编辑操作（时间范围均为闭区间）"""
+
+import pytest
+
+from recording_editor import EditableRecording
+
+
+def make_actions(count=101, step=0.1):
+    """每 step 秒一个移动，x 为序号"""
+    return [{'type': 'move', 'x': i, 'y': 0, 'time': round(i * step, 6)} for i in range(count)]
+
+
+def xs(recording):
+    return [a['x'] for a in recording]
+
+
+def times(recording):
+    return [a['time'] for a in recording]
+
+
+def test_trim_keeps_both_ends():
+    recording = EditableRecording.from_actions(make_actions())
+    recording.trim(2.0, 3.0)
+    assert xs(recording) == list(range(20, 31))
+    assert times(recording) == pytest.approx([i * 0.1 for i in range(11)])
+    assert recording.duration == pytest.approx(1.0)
+
+
+def test_trim_whole_recording_keeps_everything():
+    recording = EditableRecording.from_actions(make_actions())
+    recording.trim(0, 10)
+    assert len(recording) == 101
+
+
+def test_cut_removes_both_ends():
+    recording = EditableRecording.from_actions(make_actions())
+    recording.cut(2.0, 3.0)
+    assert xs(recording) == list(range(20)) + list(range(31, 101))
+    assert recording[20]['time'] == pytest.approx(2.1)
+    assert recording.duration == pytest.approx(9.0)
+
+
+def test_cut_at_end_removes_last_action():
+    recording = EditableRecording.from_actions(make_actions())
+    recording.cut(9, 10)
+    assert xs(recording) == list(range(90))
+
+
+def test_insert_goes_before_action_at_t():
+    recording = EditableRecording.from_actions(make_actions(11))
+    other = [{'type': 'move', 'x': 100 + i, 'y': 0, 'time': i * 0.5} for i in range(3)]
+    recording.insert(0.5, other)
+    assert xs(recording) == [0, 1, 2, 3, 4, 100, 101, 102] + list(range(5, 11))
+    assert times(recording)[4:9] == pytest.approx([0.4, 0.5, 1.0, 1.5, 1.5])
+    assert recording.duration == pytest.approx(2.0)
+
+
+def test_concatenate_with_gap():
+    recording = EditableRecording.from_actions(make_actions(3))
+    recording.concatenate(make_actions(2), gap=1.0)
+    assert times(recording) == pytest.approx([0.0, 0.1, 0.2, 1.2, 1.3])
+
+
+def test_retime_scales_range_and_shifts_rest():
+    recording = EditableRecording.from_actions(make_actions(11))
+    recording.retime(0.2, 0.4, 2.0)
+    expected = [0.0, 0.1, 0.2, 0.4, 0.6, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2]
+    assert times(recording) == pytest.approx(expected)
+    assert xs(recording) == list(range(11))
+
+
+def test_compact_round_trips():
+    recording = EditableRecording.from_actions(make_actions())
+    recording.cut(1.0, 2.0)
+    recording.retime(0.0, 3.0, 0.5)
+    recording.insert(4.0, make_actions(5))
+    before = list(recording)
+    duration = recording.duration
+
+    actions = recording.compact()
+    assert actions == before
+    assert list(recording) == before
+    assert len(recording.chunks) == 1
+    assert recording.duration == pytest.approx(duration)
+
+    # 压缩后继续编辑
+    recording.trim(0.0, 1.0)
+    assert times(recording) == pytest.approx([t for t in times(before) if t <= 1.0 + 1e-9])
+
+
+def test_invalid_range():
+    recording = EditableRecording.from_actions(make_actions())
+    with pytest.raises(ValueError):
+        recording.trim(5.0, 5.0)
+    with pytest.raises(ValueError):
+        recording.retime(1.0, 2.0, 0)
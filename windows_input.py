@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Windows 鼠标输入 - 通过 SendInput 移动鼠标
+GUI 与独立播放进程共用，只依赖 ctypes
+"""
+
+import ctypes
+from ctypes import wintypes
+
+
+# ============ Windows API 定义 ============
+
+class MOUSEINPUT(ctypes.Structure):
+    """Windows MOUSEINPUT 结构体"""
+    _fields_ = [
+        ('dx', wintypes.LONG),
+        ('dy', wintypes.LONG),
+        ('mouseData', wintypes.DWORD),
+        ('dwFlags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.POINTER(ctypes.c_ulong))
+    ]
+
+
+class INPUT(ctypes.Structure):
+    """Windows INPUT 结构体（联合体简化版）"""
+    _fields_ = [
+        ('type', wintypes.DWORD),
+        ('mi', MOUSEINPUT)
+    ]
+
+
+# Windows API 常量
+INPUT_MOUSE = 0
+MOUSEEVENTF_MOVE = 0x0001
+MOUSEEVENTF_ABSOLUTE = 0x8000
+SM_CXSCREEN = 0
+SM_CYSCREEN = 1
+
+
+class WindowsMouseInput:
+    """预先绑定的 SendInput / GetSystemMetrics
+
+    函数只解析一次并声明 argtypes/restype，INPUT 结构体也只创建一次，
+    每次移动只需写入坐标并调用 SendInput。
+    """
+
+    def __init__(self):
+        # 使用独立的 WinDLL 实例，避免与其他库共享 windll.user32 上的函数签名
+        user32 = ctypes.WinDLL('user32', use_last_error=True)
+
+        self._send_input = user32.SendInput
+        self._send_input.argtypes = (wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int)
+        self._send_input.restype = wintypes.UINT
+
+        self._get_system_metrics = user32.GetSystemMetrics
+        self._get_system_metrics.argtypes = (ctypes.c_int,)
+        self._get_system_metrics.restype = ctypes.c_int
+
+        self._input = INPUT(type=INPUT_MOUSE)
+        self._input.mi.dwFlags = MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE
+        self._input_pointer = ctypes.pointer(self._input)
+        self._input_size = ctypes.sizeof(INPUT)
+
+        self.refresh_metrics()
+
+    def refresh_metrics(self):
+        """重新读取屏幕尺寸（分辨率可能在两次播放之间改变）"""
+        self._scale_x = 65535 / self._get_system_metrics(SM_CXSCREEN)
+        self._scale_y = 65535 / self._get_system_metrics(SM_CYSCREEN)
+
+    def move(self, x, y):
+        """移动到屏幕绝对坐标 (x, y)，返回成功发送的事件数"""
+        mi = self._input.mi
+        # 转换为 Windows 归一化坐标（0-65535）
+        mi.dx = int(x * self._scale_x)
+        mi.dy = int(y * self._scale_y)
+        return self._send_input(1, self._input_pointer, self._input_size)